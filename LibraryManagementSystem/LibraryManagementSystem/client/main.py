@@ -36,22 +36,34 @@ def main():
         # Create the login window
         login_window = LoginWindow(client)
         
-        # Create admin and user windows (hidden initially)
-        admin_window = AdminWindow(client, {})
-        user_window = UserWindow(client, {})
+        # Admin and user windows, created on first login for their role
+        admin_window = None
+        user_window = None
         
         # Connect login window signals
         def handle_login_successful(user_data):
             """Handle successful login."""
+            nonlocal admin_window, user_window
+            
             # Hide the login window
             login_window.hide()
             
             # Show the appropriate window based on user role
             if user_data.get('role') == 'admin':
+                # Build the admin window the first time an admin logs in
+                if admin_window is None:
+                    admin_window = AdminWindow(client, user_data)
+                    admin_window.logout_requested.connect(handle_logout)
+                
                 # Update admin window with user data
                 admin_window.user_data = user_data
                 admin_window.show()
             else:
+                # Build the user window the first time a user logs in
+                if user_window is None:
+                    user_window = UserWindow(client, user_data)
+                    user_window.logout_requested.connect(handle_logout)
+                
                 # Update user window with user data
                 user_window.user_data = user_data
                 user_window.show()
@@ -59,17 +71,17 @@ def main():
         # Connect logout signals
         def handle_logout():
             """Handle logout."""
-            # Hide the windows
-            admin_window.hide()
-            user_window.hide()
+            # Hide the windows that have been created
+            if admin_window is not None:
+                admin_window.hide()
+            if user_window is not None:
+                user_window.hide()
             
             # Show the login window
             login_window.show()
         
         # Connect signals
         login_window.login_successful.connect(handle_login_successful)
-        admin_window.logout_requested.connect(handle_logout)
-        user_window.logout_requested.connect(handle_logout)
         
         # Show the login window
         login_window.show()
@@ -18,6 +18,9 @@ from .dialogs.user_dialog import UserDialog
 
 logger = get_logger(__name__)
 
+# Book fields shown in the book table, in column order
+_BOOK_COLUMNS = ('book_id', 'title', 'author', 'isbn', 'category', 'quantity', 'available')
+
 class AdminWindow(QMainWindow):
     """Admin window for the Library Management System."""
     
@@ -443,21 +446,18 @@ class AdminWindow(QMainWindow):
         if response.get('success'):
             books = response.get('data', [])
             
-            # Clear the table
-            self.book_table.setRowCount(0)
+            # Size the table once and suspend repaints while filling it
+            self.book_table.setUpdatesEnabled(False)
+            self.book_table.setRowCount(len(books))
             
             # Add books to the table
-            for book in books:
-                row = self.book_table.rowCount()
-                self.book_table.insertRow(row)
-                
-                self.book_table.setItem(row, 0, QTableWidgetItem(str(book.get('book_id'))))
-                self.book_table.setItem(row, 1, QTableWidgetItem(book.get('title')))
-                self.book_table.setItem(row, 2, QTableWidgetItem(book.get('author')))
-                self.book_table.setItem(row, 3, QTableWidgetItem(book.get('isbn')))
-                self.book_table.setItem(row, 4, QTableWidgetItem(book.get('category', '')))
-                self.book_table.setItem(row, 5, QTableWidgetItem(str(book.get('quantity', 0))))
-                self.book_table.setItem(row, 6, QTableWidgetItem(str(book.get('available', 0))))
+            set_item = self.book_table.setItem
+            for row, book in enumerate(books):
+                for column, key in enumerate(_BOOK_COLUMNS):
+                    value = book.get(key)
+                    set_item(row, column, QTableWidgetItem('' if value is None else str(value)))
+            
+            self.book_table.setUpdatesEnabled(True)
             
             self.statusBar().showMessage(f"Loaded {len(books)} books")
         else:
@@ -514,14 +514,13 @@ class AdminWindow(QMainWindow):
     def edit_book(self):
         """Edit a book."""
         # Get selected row
-        selected_rows = self.book_table.selectedItems()
+        row = self.book_table.currentRow()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a book to edit.')
             return
         
         # Get book ID
-        row = selected_rows[0].row()
         book_id = int(self.book_table.item(row, 0).text())
         
         # Get book data
@@ -567,14 +566,13 @@ class AdminWindow(QMainWindow):
     def delete_book(self):
         """Delete a book."""
         # Get selected row
-        selected_rows = self.book_table.selectedItems()
+        row = self.book_table.currentRow()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a book to delete.')
             return
         
         # Get book ID
-        row = selected_rows[0].row()
         book_id = int(self.book_table.item(row, 0).text())
         book_title = self.book_table.item(row, 1).text()
         
@@ -621,20 +619,20 @@ class AdminWindow(QMainWindow):
         if response.get('success'):
             users = response.get('data', [])
             
-            # Clear the table
-            self.user_table.setRowCount(0)
+            # Size the table once and suspend repaints while filling it
+            self.user_table.setUpdatesEnabled(False)
+            self.user_table.setRowCount(len(users))
             
             # Add users to the table
-            for user in users:
-                row = self.user_table.rowCount()
-                self.user_table.insertRow(row)
-                
+            for row, user in enumerate(users):
                 self.user_table.setItem(row, 0, QTableWidgetItem(str(user.get('user_id'))))
                 self.user_table.setItem(row, 1, QTableWidgetItem(user.get('username')))
                 self.user_table.setItem(row, 2, QTableWidgetItem(user.get('full_name', '')))
                 self.user_table.setItem(row, 3, QTableWidgetItem(user.get('email', '')))
                 self.user_table.setItem(row, 4, QTableWidgetItem(user.get('role', 'user')))
             
+            self.user_table.setUpdatesEnabled(True)
+            
             self.statusBar().showMessage(f"Loaded {len(users)} users")
         else:
             self.statusBar().showMessage(f"Error loading users: {response.get('message')}")
@@ -713,14 +711,13 @@ class AdminWindow(QMainWindow):
     def edit_user(self):
         """Edit a user."""
         # Get selected row
-        selected_rows = self.user_table.selectedItems()
+        row = self.user_table.currentRow()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a user to edit.')
             return
         
         # Get user ID
-        row = selected_rows[0].row()
         user_id = int(self.user_table.item(row, 0).text())
         
         # Get user data
@@ -765,14 +762,13 @@ class AdminWindow(QMainWindow):
     def delete_user(self):
         """Delete a user."""
         # Get selected row
-        selected_rows = self.user_table.selectedItems()
+        row = self.user_table.currentRow()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a user to delete.')
             return
         
         # Get user ID
-        row = selected_rows[0].row()
         user_id = int(self.user_table.item(row, 0).text())
         username = self.user_table.item(row, 1).text()
         
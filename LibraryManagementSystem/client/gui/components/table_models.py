@@ -0,0 +1,137 @@
+"""
+Table models for the Library Management System client.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Availability labels indexed by whether any copies are available
+_AVAIL = ('Not Available', 'Available')
+
+class DictTableModel(QAbstractTableModel):
+    """Read-only table model backed by a list of dictionaries."""
+    
+    # (header, key) pairs describing the columns, set by subclasses
+    COLUMNS = ()
+    
+    def __init__(self, parent=None):
+        """
+        Initialize the table model.
+        
+        Args:
+            parent: The parent object.
+        """
+        super().__init__(parent)
+        
+        self._rows = []
+    
+    def set_rows(self, rows):
+        """
+        Replace the rows shown by the model.
+        
+        Args:
+            rows (list): A list of row dictionaries.
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+    
+    def row_data(self, row):
+        """
+        Get the dictionary backing a row.
+        
+        Args:
+            row (int): The row number.
+        
+        Returns:
+            dict: The row dictionary.
+        """
+        return self._rows[row]
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of rows."""
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Return the data for a cell.
+        
+        Only the display role is served; Qt asks for the visible cells only.
+        
+        Args:
+            index (QModelIndex): The cell index.
+            role (int): The data role.
+        
+        Returns:
+            str or None: The cell text, or None for other roles.
+        """
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        
+        return self.display_value(self._rows[index.row()], index.column())
+    
+    def display_value(self, row, column):
+        """
+        Format a cell value for display.
+        
+        Args:
+            row (dict): The row dictionary.
+            column (int): The column number.
+        
+        Returns:
+            str: The cell text.
+        """
+        value = row.get(self.COLUMNS[column][1])
+        return '' if value is None else str(value)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Return the header labels."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        
+        return super().headerData(section, orientation, role)
+
+class BookTableModel(DictTableModel):
+    """Table model for the book catalog."""
+    
+    COLUMNS = (
+        ('ID', 'book_id'),
+        ('Title', 'title'),
+        ('Author', 'author'),
+        ('ISBN', 'isbn'),
+        ('Publisher', 'publisher'),
+        ('Category', 'category'),
+        ('Available', 'available'),
+    )
+    
+    def display_value(self, row, column):
+        """Format a cell value, showing availability as text."""
+        if column == 6:
+            return _AVAIL[row.get('available', 0) > 0]
+        
+        return super().display_value(row, column)
+
+class TransactionTableModel(DictTableModel):
+    """Table model for a user's transactions."""
+    
+    COLUMNS = (
+        ('ID', 'transaction_id'),
+        ('Book Title', 'book_title'),
+        ('Borrow Date', 'borrow_date'),
+        ('Due Date', 'due_date'),
+        ('Return Date', 'return_date'),
+        ('Status', 'status'),
+    )
+    
+    def display_value(self, row, column):
+        """Format a cell value, defaulting unknown book titles."""
+        if column == 1:
+            return row.get('book_title') or 'Unknown'
+        
+        return super().display_value(row, column)
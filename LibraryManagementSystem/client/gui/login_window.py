@@ -2,15 +2,20 @@
 Login window for the Library Management System client.
 """
 
+import threading
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QMessageBox, QComboBox
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QMetaObject
+from PyQt5 import sip
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Roles offered in the role selector
+_ROLES = ('User', 'Admin')
+
 class LoginWindow(QWidget):
     """Login window for the Library Management System."""
     
@@ -28,6 +33,9 @@ class LoginWindow(QWidget):
         
         self.client = client
         
+        # Cleared on close so late login responses are dropped
+        self._alive = True
+        
         # Initialize UI
         self.init_ui()
     
@@ -81,8 +89,7 @@ class LoginWindow(QWidget):
         role_label = QLabel('Role:')
         role_label.setMinimumWidth(80)
         self.role_combo = QComboBox()
-        self.role_combo.addItem('User')
-        self.role_combo.addItem('Admin')
+        self.role_combo.addItems(_ROLES)
         role_layout.addWidget(role_label)
         role_layout.addWidget(self.role_combo)
         layout.addLayout(role_layout)
@@ -105,6 +112,25 @@ class LoginWindow(QWidget):
         self.username_input.returnPressed.connect(self.login)
         self.password_input.returnPressed.connect(self.login)
     
+    def showEvent(self, event):
+        """
+        Handle window show event.
+        
+        Starts connecting to the server in the background so the socket is
+        already open by the time the user submits their credentials.
+        
+        Args:
+            event: The show event.
+        """
+        super().showEvent(event)
+        self._alive = True
+        
+        # Pre-warm the connection while the user is typing
+        if not self.client.connected:
+            connect_thread = threading.Thread(target=self.client.connect)
+            connect_thread.daemon = True
+            connect_thread.start()
+    
     def login(self):
         """Handle login button click."""
         # Get username and password
@@ -143,6 +169,10 @@ class LoginWindow(QWidget):
         Args:
             response (dict): The response from the server.
         """
+        # Ignore responses that arrive after the window was closed
+        if not self._alive or sip.isdeleted(self):
+            return
+        
         # Re-enable login button
         self.login_button.setEnabled(True)
         self.login_button.setText('Login')
@@ -191,6 +221,8 @@ class LoginWindow(QWidget):
         Args:
             event: The close event.
         """
+        self._alive = False
+        
         # Disconnect from server
         self.client.disconnect()
         
@@ -2,22 +2,56 @@
 User window for the Library Management System client.
 """
 
+import collections
+import hashlib
+import itertools
+import json
+import time
 from PyQt5.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QLabel, QPushButton, QTableView, QAbstractItemView, QHeaderView,
     QLineEdit, QComboBox, QMessageBox, QDialog, QFormLayout
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QThread, QSortFilterProxyModel
 from utils.logger import get_logger
+from .components.table_models import BookTableModel, TransactionTableModel
+from ..network.request_worker import RequestWorker
 
 logger = get_logger(__name__)
 
+# Fixed column widths so the header never measures cell contents
+_BOOK_COLUMN_WIDTHS = (60, 260, 160, 120, 140, 100, 90)
+_TRANSACTION_COLUMN_WIDTHS = (60, 260, 150, 150, 150, 90)
+
+# Book table column searched for each "Search by" option
+_SEARCH_COLUMNS = {'Title': 1, 'Author': 2, 'ISBN': 3, 'Category': 5}
+
+# Client-side response cache settings
+_CACHE_TTL = 5.0  # seconds
+_CACHE_SIZE = 128
+
+def _payload_digest(rows):
+    """
+    Compute a short digest of a response payload.
+    
+    Args:
+        rows (list): The response rows.
+    
+    Returns:
+        bytes: An 8-byte BLAKE2b digest of the rows.
+    """
+    payload = json.dumps(rows, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=8).digest()
+
 class UserWindow(QMainWindow):
     """User window for the Library Management System."""
     
     # Signal emitted when logout is requested
     logout_requested = pyqtSignal()
     
+    # Signal used to hand requests to the worker thread
+    request_queued = pyqtSignal(int, str, object)
+    
     def __init__(self, client, user_data):
         """
         Initialize the user window.
@@ -31,12 +65,47 @@ class UserWindow(QMainWindow):
         self.client = client
         self.user_data = user_data
         
+        # Current transaction filter, kept in step with the filter combo
+        self._filter_text = 'all'
+        
+        # Full transaction list from the last load, filtered locally by status
+        self._all_txns = None
+        
+        # Digests of the last loaded payloads, used to skip identical reloads
+        self._books_digest = None
+        self._txns_digest = None
+        
+        # Recent read responses keyed by (endpoint, data), oldest first
+        self._resp_cache = collections.OrderedDict()
+        
+        # Send requests from a worker thread so socket writes never block the UI
+        self._tokens = {}
+        self._token_counter = itertools.count(1)
+        self._worker_thread = QThread(self)
+        self._worker = RequestWorker(client)
+        self._worker.moveToThread(self._worker_thread)
+        self.request_queued.connect(self._worker.do_request)
+        self._worker.response_ready.connect(self._on_response_ready)
+        self._worker.request_failed.connect(self._on_request_failed)
+        self._worker_thread.start()
+        
         # Initialize UI
         self.init_ui()
         
         # Load initial data
         self.load_data()
     
+    @property
+    def user_data(self):
+        """dict: The logged-in user's data."""
+        return self._user_data
+    
+    @user_data.setter
+    def user_data(self, user_data):
+        # Snapshot the user ID so request paths don't look it up each time
+        self._user_data = user_data
+        self._user_id = user_data.get('user_id')
+    
     def init_ui(self):
         """Initialize the user interface."""
         # Set window properties
@@ -103,12 +172,14 @@ class UserWindow(QMainWindow):
         self.book_search_input = QLineEdit()
         self.book_search_input.setPlaceholderText('Enter search term')
         self.book_search_input.returnPressed.connect(self.search_books)
+        self.book_search_input.textChanged.connect(self.filter_books)
         
         search_by_label = QLabel('Search by:')
         self.book_search_by = QComboBox()
-        self.book_search_by.addItems(['Title', 'Author', 'ISBN', 'Category'])
+        self.book_search_by.addItems(list(_SEARCH_COLUMNS))
+        self.book_search_by.currentIndexChanged.connect(self.filter_books)
         
-        search_button = QPushButton('Search')
+        search_button = QPushButton('Search Server')
         search_button.clicked.connect(self.search_books)
         
         reset_button = QPushButton('Reset')
@@ -124,15 +195,22 @@ class UserWindow(QMainWindow):
         layout.addLayout(search_layout)
         
         # Create book table
-        self.book_table = QTableWidget()
-        self.book_table.setColumnCount(7)
-        self.book_table.setHorizontalHeaderLabels([
-            'ID', 'Title', 'Author', 'ISBN', 'Publisher', 
-            'Category', 'Available'
-        ])
-        self.book_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.book_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.book_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.book_model = BookTableModel(self)
+        
+        # Filter the loaded books locally as the search text changes
+        self.book_proxy = QSortFilterProxyModel(self)
+        self.book_proxy.setSourceModel(self.book_model)
+        self.book_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.book_proxy.setFilterKeyColumn(_SEARCH_COLUMNS['Title'])
+        
+        self.book_table = QTableView()
+        self.book_table.setModel(self.book_proxy)
+        self.book_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.book_table.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate(_BOOK_COLUMN_WIDTHS):
+            self.book_table.setColumnWidth(column, width)
+        self.book_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.book_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
         layout.addWidget(self.book_table)
         
@@ -146,7 +224,7 @@ class UserWindow(QMainWindow):
         view_details_button.clicked.connect(self.view_book_details)
         
         refresh_button = QPushButton('Refresh')
-        refresh_button.clicked.connect(self.load_books)
+        refresh_button.clicked.connect(self.refresh_books)
         
         controls_layout.addWidget(borrow_book_button)
         controls_layout.addWidget(view_details_button)
@@ -174,10 +252,16 @@ class UserWindow(QMainWindow):
         filter_label = QLabel('Filter by status:')
         self.transaction_filter = QComboBox()
         self.transaction_filter.addItems(['All', 'Borrowed', 'Returned', 'Overdue'])
+        
+        # Coalesce rapid filter changes into a single request
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self.apply_transaction_filter)
         self.transaction_filter.currentIndexChanged.connect(self.filter_transactions)
         
         refresh_button = QPushButton('Refresh')
-        refresh_button.clicked.connect(self.load_transactions)
+        refresh_button.clicked.connect(self.refresh_transactions)
         
         filter_layout.addWidget(filter_label)
         filter_layout.addWidget(self.transaction_filter)
@@ -187,14 +271,15 @@ class UserWindow(QMainWindow):
         layout.addLayout(filter_layout)
         
         # Create transaction table
-        self.transaction_table = QTableWidget()
-        self.transaction_table.setColumnCount(6)
-        self.transaction_table.setHorizontalHeaderLabels([
-            'ID', 'Book Title', 'Borrow Date', 'Due Date', 'Return Date', 'Status'
-        ])
-        self.transaction_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.transaction_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.transaction_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.transaction_model = TransactionTableModel(self)
+        self.transaction_table = QTableView()
+        self.transaction_table.setModel(self.transaction_model)
+        self.transaction_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.transaction_table.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate(_TRANSACTION_COLUMN_WIDTHS):
+            self.transaction_table.setColumnWidth(column, width)
+        self.transaction_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.transaction_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
         layout.addWidget(self.transaction_table)
         
@@ -286,9 +371,102 @@ class UserWindow(QMainWindow):
         self.load_books()
         self.load_transactions()
     
+    def send_request(self, endpoint, data, callback):
+        """
+        Queue a request on the worker thread.
+        
+        Args:
+            endpoint (str): The action to perform.
+            data (dict): The request data.
+            callback (callable): The function to call with the response.
+            
+        Returns:
+            bool: True once the request has been queued.
+        """
+        # closeEvent stops the worker, but main.py shows this window again on the next login
+        if not self._worker_thread.isRunning():
+            self._worker_thread.start()
+        
+        token = next(self._token_counter)
+        self._tokens[token] = callback
+        self.request_queued.emit(token, endpoint, data)
+        return True
+    
+    def _on_response_ready(self, token, response):
+        """
+        Dispatch a response from the worker thread to its callback.
+        
+        Args:
+            token (int): The request token.
+            response (dict): The response from the server.
+        """
+        callback = self._tokens.pop(token, None)
+        if callback:
+            callback(response)
+    
+    def _on_request_failed(self, token):
+        """
+        Forget the callback of a request that could not be sent.
+        
+        Args:
+            token (int): The request token.
+        """
+        self._tokens.pop(token, None)
+    
+    def cached_request(self, endpoint, data, callback):
+        """
+        Send a read-only request, answering from the local cache when possible.
+        
+        Successful responses are kept for a few seconds so that toggling
+        filters or repeating a search does not go back to the server.
+        
+        Args:
+            endpoint (str): The action to perform.
+            data (dict): The request data.
+            callback (callable): The function to call with the response.
+            
+        Returns:
+            bool: True if the request was answered or sent, False otherwise.
+        """
+        key = (endpoint, tuple(sorted(data.items())))
+        
+        # Serve fresh entries straight from the cache
+        entry = self._resp_cache.get(key)
+        if entry and time.monotonic() - entry[0] < _CACHE_TTL:
+            self._resp_cache.move_to_end(key)
+            callback(entry[1])
+            return True
+        
+        def store_response(response):
+            # Only cache successful responses
+            if response.get('success'):
+                self._resp_cache[key] = (time.monotonic(), response)
+                self._resp_cache.move_to_end(key)
+                if len(self._resp_cache) > _CACHE_SIZE:
+                    self._resp_cache.popitem(last=False)
+            
+            callback(response)
+        
+        return self.send_request(endpoint, data, store_response)
+    
+    def invalidate_cache(self, *prefixes):
+        """
+        Drop cached responses whose endpoint starts with one of the prefixes.
+        
+        Args:
+            *prefixes (str): Endpoint prefixes to drop.
+        """
+        for key in [key for key in self._resp_cache if key[0].startswith(prefixes)]:
+            del self._resp_cache[key]
+    
     def load_books(self):
         """Load books from the server."""
-        self.client.send_request('book_get_all', {}, self.handle_books_response)
+        self.cached_request('book_get_all', {}, self.handle_books_response)
+    
+    def refresh_books(self):
+        """Reload books from the server, bypassing the cache."""
+        self.invalidate_cache('book_')
+        self.load_books()
     
     def handle_books_response(self, response):
         """
@@ -300,32 +478,26 @@ class UserWindow(QMainWindow):
         if response.get('success'):
             books = response.get('data', [])
             
-            # Clear the table
-            self.book_table.setRowCount(0)
+            # Leave the table alone if the server sent the same books again
+            digest = _payload_digest(books)
             
-            # Add books to the table
-            for book in books:
-                row = self.book_table.rowCount()
-                self.book_table.insertRow(row)
+            if digest != self._books_digest:
+                self._books_digest = digest
                 
-                self.book_table.setItem(row, 0, QTableWidgetItem(str(book.get('book_id'))))
-                self.book_table.setItem(row, 1, QTableWidgetItem(book.get('title')))
-                self.book_table.setItem(row, 2, QTableWidgetItem(book.get('author')))
-                self.book_table.setItem(row, 3, QTableWidgetItem(book.get('isbn')))
-                self.book_table.setItem(row, 4, QTableWidgetItem(book.get('publisher', '')))
-                self.book_table.setItem(row, 5, QTableWidgetItem(book.get('category', '')))
-                
-                # Set availability
-                available = book.get('available', 0)
-                availability_text = 'Available' if available > 0 else 'Not Available'
-                self.book_table.setItem(row, 6, QTableWidgetItem(availability_text))
+                # Hand the rows to the model; the view only renders visible cells
+                self.book_model.set_rows(books)
             
             self.statusBar().showMessage(f"Loaded {len(books)} books")
         else:
             self.statusBar().showMessage(f"Error loading books: {response.get('message')}")
     
+    def filter_books(self):
+        """Filter the loaded books locally by the search text."""
+        self.book_proxy.setFilterKeyColumn(_SEARCH_COLUMNS[self.book_search_by.currentText()])
+        self.book_proxy.setFilterFixedString(self.book_search_input.text().strip())
+    
     def search_books(self):
-        """Search for books."""
+        """Search for books on the server."""
         query = self.book_search_input.text().strip()
         
         if not query:
@@ -339,7 +511,7 @@ class UserWindow(QMainWindow):
             'search_by': search_by_text
         }
         
-        self.client.send_request('book_search', data, self.handle_books_response)
+        self.cached_request('book_search', data, self.handle_books_response)
     
     def reset_book_search(self):
         """Reset book search."""
@@ -349,20 +521,19 @@ class UserWindow(QMainWindow):
     def borrow_book(self):
         """Borrow a book."""
         # Get selected row
-        selected_rows = self.book_table.selectedItems()
+        row = self.book_proxy.mapToSource(self.book_table.currentIndex()).row()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a book to borrow.')
             return
         
         # Get book ID
-        row = selected_rows[0].row()
-        book_id = int(self.book_table.item(row, 0).text())
-        book_title = self.book_table.item(row, 1).text()
-        availability = self.book_table.item(row, 6).text()
+        book = self.book_model.row_data(row)
+        book_id = book['book_id']
+        book_title = book.get('title')
         
         # Check if the book is available
-        if availability != 'Available':
+        if book.get('available', 0) <= 0:
             QMessageBox.warning(self, 'Warning', 'This book is not available for borrowing.')
             return
         
@@ -378,7 +549,7 @@ class UserWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             # Send request to server
             data = {'book_id': book_id}
-            self.client.send_request('book_borrow', data, self.handle_borrow_book_response)
+            self.send_request('book_borrow', data, self.handle_borrow_book_response)
     
     def handle_borrow_book_response(self, response):
         """
@@ -389,6 +560,7 @@ class UserWindow(QMainWindow):
         """
         if response.get('success'):
             QMessageBox.information(self, 'Success', 'Book borrowed successfully.')
+            self.invalidate_cache('book_', 'user_get_transactions')
             self.load_books()
             self.load_transactions()
         else:
@@ -397,19 +569,18 @@ class UserWindow(QMainWindow):
     def view_book_details(self):
         """View book details."""
         # Get selected row
-        selected_rows = self.book_table.selectedItems()
+        row = self.book_proxy.mapToSource(self.book_table.currentIndex()).row()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a book to view details.')
             return
         
         # Get book ID
-        row = selected_rows[0].row()
-        book_id = int(self.book_table.item(row, 0).text())
+        book_id = self.book_model.row_data(row)['book_id']
         
         # Get book data
         data = {'book_id': book_id}
-        self.client.send_request('book_get', data, self.handle_book_details_response)
+        self.cached_request('book_get', data, self.handle_book_details_response)
     
     def handle_book_details_response(self, response):
         """
@@ -422,14 +593,16 @@ class UserWindow(QMainWindow):
             book = response.get('data', {})
             
             # Create message
-            message = f"Title: {book.get('title')}\n"
-            message += f"Author: {book.get('author')}\n"
-            message += f"ISBN: {book.get('isbn')}\n"
-            message += f"Publisher: {book.get('publisher', 'N/A')}\n"
-            message += f"Publication Year: {book.get('publication_year', 'N/A')}\n"
-            message += f"Category: {book.get('category', 'N/A')}\n"
-            message += f"Available: {book.get('available', 0)}/{book.get('quantity', 0)}\n"
-            message += f"Description: {book.get('description', 'N/A')}"
+            message = (
+                f"Title: {book.get('title')}\n"
+                f"Author: {book.get('author')}\n"
+                f"ISBN: {book.get('isbn')}\n"
+                f"Publisher: {book.get('publisher', 'N/A')}\n"
+                f"Publication Year: {book.get('publication_year', 'N/A')}\n"
+                f"Category: {book.get('category', 'N/A')}\n"
+                f"Available: {book.get('available', 0)}/{book.get('quantity', 0)}\n"
+                f"Description: {book.get('description', 'N/A')}"
+            )
             
             # Show message
             QMessageBox.information(self, 'Book Details', message)
@@ -438,16 +611,14 @@ class UserWindow(QMainWindow):
     
     def load_transactions(self):
         """Load transactions from the server."""
-        # Get user ID
-        user_id = self.user_data.get('user_id')
-        
-        # Get filter
-        filter_text = self.transaction_filter.currentText().lower()
-        status = None if filter_text == 'all' else filter_text
-        
-        # Send request to server
-        data = {'user_id': user_id, 'status': status}
-        self.client.send_request('user_get_transactions', data, self.handle_transactions_response)
+        # Always fetch every status; the filter is applied locally
+        data = {'user_id': self._user_id, 'status': None}
+        self.cached_request('user_get_transactions', data, self.handle_transactions_response)
+    
+    def refresh_transactions(self):
+        """Reload transactions from the server, bypassing the cache."""
+        self.invalidate_cache('user_get_transactions')
+        self.load_transactions()
     
     def handle_transactions_response(self, response):
         """
@@ -459,43 +630,57 @@ class UserWindow(QMainWindow):
         if response.get('success'):
             transactions = response.get('data', [])
             
-            # Clear the table
-            self.transaction_table.setRowCount(0)
+            # Leave the table alone if the server sent the same transactions again
+            digest = _payload_digest(transactions)
             
-            # Add transactions to the table
-            for transaction in transactions:
-                row = self.transaction_table.rowCount()
-                self.transaction_table.insertRow(row)
-                
-                self.transaction_table.setItem(row, 0, QTableWidgetItem(str(transaction.get('transaction_id'))))
-                self.transaction_table.setItem(row, 1, QTableWidgetItem(transaction.get('book_title', 'Unknown')))
-                self.transaction_table.setItem(row, 2, QTableWidgetItem(transaction.get('borrow_date', '')))
-                self.transaction_table.setItem(row, 3, QTableWidgetItem(transaction.get('due_date', '')))
-                self.transaction_table.setItem(row, 4, QTableWidgetItem(transaction.get('return_date', '')))
-                self.transaction_table.setItem(row, 5, QTableWidgetItem(transaction.get('status', '')))
+            if digest == self._txns_digest:
+                self.statusBar().showMessage(f"Loaded {len(transactions)} transactions")
+                return
             
-            self.statusBar().showMessage(f"Loaded {len(transactions)} transactions")
+            self._txns_digest = digest
+            self._all_txns = transactions
+            self.apply_transaction_filter()
         else:
             self.statusBar().showMessage(f"Error loading transactions: {response.get('message')}")
     
     def filter_transactions(self):
-        """Filter transactions."""
-        self.load_transactions()
+        """Filter transactions once the filter selection settles."""
+        self._filter_text = self.transaction_filter.currentText().lower()
+        self._filter_timer.start()
+    
+    def apply_transaction_filter(self):
+        """Show the loaded transactions matching the current status filter."""
+        # Nothing loaded yet, so fetch from the server first
+        if self._all_txns is None:
+            self.load_transactions()
+            return
+        
+        status = self._filter_text
+        
+        if status == 'all':
+            transactions = self._all_txns
+        else:
+            transactions = [t for t in self._all_txns if (t.get('status') or '').lower() == status]
+        
+        # Hand the rows to the model; the view only renders visible cells
+        self.transaction_model.set_rows(transactions)
+        
+        self.statusBar().showMessage(f"Loaded {len(transactions)} transactions")
     
     def return_book(self):
         """Return a book."""
         # Get selected row
-        selected_rows = self.transaction_table.selectedItems()
+        row = self.transaction_table.currentIndex().row()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a transaction to return the book.')
             return
         
         # Get transaction ID
-        row = selected_rows[0].row()
-        transaction_id = int(self.transaction_table.item(row, 0).text())
-        book_title = self.transaction_table.item(row, 1).text()
-        status = self.transaction_table.item(row, 5).text()
+        transaction = self.transaction_model.row_data(row)
+        transaction_id = transaction['transaction_id']
+        book_title = transaction.get('book_title') or 'Unknown'
+        status = transaction.get('status') or ''
         
         # Check if the book is already returned
         if status.lower() == 'returned':
@@ -514,7 +699,7 @@ class UserWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             # Send request to server
             data = {'transaction_id': transaction_id}
-            self.client.send_request('book_return', data, self.handle_return_book_response)
+            self.send_request('book_return', data, self.handle_return_book_response)
     
     def handle_return_book_response(self, response):
         """
@@ -525,6 +710,7 @@ class UserWindow(QMainWindow):
         """
         if response.get('success'):
             QMessageBox.information(self, 'Success', 'Book returned successfully.')
+            self.invalidate_cache('book_', 'user_get_transactions')
             self.load_transactions()
             self.load_books()
         else:
@@ -533,30 +719,32 @@ class UserWindow(QMainWindow):
     def view_transaction_details(self):
         """View transaction details."""
         # Get selected row
-        selected_rows = self.transaction_table.selectedItems()
+        row = self.transaction_table.currentIndex().row()
         
-        if not selected_rows:
+        if row < 0:
             QMessageBox.warning(self, 'Warning', 'Please select a transaction to view details.')
             return
         
         # Get transaction ID
-        row = selected_rows[0].row()
-        transaction_id = int(self.transaction_table.item(row, 0).text())
+        transaction = self.transaction_model.row_data(row)
+        transaction_id = transaction['transaction_id']
         
         # Show transaction details
-        message = f"Transaction ID: {transaction_id}\n"
-        message += f"Book: {self.transaction_table.item(row, 1).text()}\n"
-        message += f"Borrow Date: {self.transaction_table.item(row, 2).text()}\n"
-        message += f"Due Date: {self.transaction_table.item(row, 3).text()}\n"
-        message += f"Return Date: {self.transaction_table.item(row, 4).text() or 'Not returned yet'}\n"
-        message += f"Status: {self.transaction_table.item(row, 5).text()}"
+        message = "\n".join((
+            f"Transaction ID: {transaction_id}",
+            f"Book: {transaction.get('book_title') or 'Unknown'}",
+            f"Borrow Date: {transaction.get('borrow_date') or ''}",
+            f"Due Date: {transaction.get('due_date') or ''}",
+            f"Return Date: {transaction.get('return_date') or 'Not returned yet'}",
+            f"Status: {transaction.get('status') or ''}",
+        ))
         
         QMessageBox.information(self, 'Transaction Details', message)
     
     def save_profile(self):
         """Save profile changes."""
         # Get user data
-        user_id = self.user_data.get('user_id')
+        user_id = self._user_id
         full_name = self.full_name_input.text().strip()
         email = self.email_input.text().strip()
         phone = self.phone_input.text().strip()
@@ -595,7 +783,7 @@ class UserWindow(QMainWindow):
             data['password'] = password
         
         # Send request to server
-        self.client.send_request('user_update', data, self.handle_update_profile_response)
+        self.send_request('user_update', data, self.handle_update_profile_response)
     
     def handle_update_profile_response(self, response):
         """
@@ -667,6 +855,10 @@ class UserWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            # Stop the request worker
+            self._worker_thread.quit()
+            self._worker_thread.wait()
+            
             # Disconnect from server
             self.client.disconnect()
             
@@ -5,7 +5,7 @@ Client entry point for the Library Management System.
 import sys
 import os
 from utils.fix_qt_font_error import create_application  # Import the fix
-import importlib.util
+import importlib
 
 # Add project root to path for direct execution
 if __name__ == '__main__':
@@ -15,39 +15,29 @@ if __name__ == '__main__':
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
-# Try absolute imports first (when running as a package)
-try:
-    from LibraryManagementSystem.client.gui.login_window import LoginWindow
-    from LibraryManagementSystem.client.gui.admin_window import AdminWindow
-    from LibraryManagementSystem.client.gui.user_window import UserWindow
-    from LibraryManagementSystem.client.network.client import Client
-    from LibraryManagementSystem.utils.logger import get_logger
-    from LibraryManagementSystem.utils.config import SERVER_HOST, SERVER_PORT
-except ImportError:
-    # Fall back to relative imports (when running directly)
-    try:
-        from client.gui.login_window import LoginWindow
-        from client.gui.admin_window import AdminWindow
-        from client.gui.user_window import UserWindow
-        from client.network.client import Client
-        from utils.logger import get_logger
-        from utils.config import SERVER_HOST, SERVER_PORT
-    except ImportError:
-        # Last resort: try relative import
-        from .gui.login_window import LoginWindow
-        from .gui.admin_window import AdminWindow
-        from .gui.user_window import UserWindow
-        from .network.client import Client
-        from utils.logger import get_logger
-        from utils.config import SERVER_HOST, SERVER_PORT
+# Import from whichever package this module was loaded as: the full
+# 'LibraryManagementSystem.client' package or the top-level 'client' package
+_PACKAGE = __package__ or 'client'
+_BASE = _PACKAGE[:-len('client')]
+
+LoginWindow = importlib.import_module(f'{_PACKAGE}.gui.login_window').LoginWindow
+AdminWindow = importlib.import_module(f'{_PACKAGE}.gui.admin_window').AdminWindow
+UserWindow = importlib.import_module(f'{_PACKAGE}.gui.user_window').UserWindow
+Client = importlib.import_module(f'{_PACKAGE}.network.client').Client
+get_logger = importlib.import_module(f'{_BASE}utils.logger').get_logger
+
+_config = importlib.import_module(f'{_BASE}utils.config')
+SERVER_HOST = _config.SERVER_HOST
+SERVER_PORT = _config.SERVER_PORT
+CLIENT_CONNECTIONS = _config.CLIENT_CONNECTIONS
 
 logger = get_logger(__name__)
 
 def main():
     """Main entry point for the client application."""
     try:
-        # Create a client instance
-        client = Client(SERVER_HOST, SERVER_PORT)
+        # Create a pooled client so independent requests don't queue on one socket
+        client = Client(SERVER_HOST, SERVER_PORT, max_connections=CLIENT_CONNECTIONS)
         
         # Create the Qt application
         app = create_application(sys.argv)  # Use the fixed application creator
@@ -55,9 +45,8 @@ def main():
         # Create the login window
         login_window = LoginWindow(client)
         
-        # Create admin and user windows (hidden initially)
-        admin_window = AdminWindow(client, {})
-        user_window = UserWindow(client, {})
+        # Admin and user windows, created on first login for their role
+        windows = {}
         
         # Connect login window signals
         def handle_login_successful(user_data):
@@ -65,30 +54,33 @@ def main():
             # Hide the login window
             login_window.hide()
             
-            # Show the appropriate window based on user role
-            if user_data.get('role') == 'admin':
-                # Update admin window with user data
-                admin_window.user_data = user_data
-                admin_window.show()
-            else:
-                # Update user window with user data
-                user_window.user_data = user_data
-                user_window.show()
+            # Pick the window class based on user role
+            role = 'admin' if user_data.get('role') == 'admin' else 'user'
+            window = windows.get(role)
+            
+            if window is None:
+                # Build the window the first time this role logs in
+                window_class = AdminWindow if role == 'admin' else UserWindow
+                window = window_class(client, user_data)
+                window.logout_requested.connect(handle_logout)
+                windows[role] = window
+            
+            # Update the window with user data and show it
+            window.user_data = user_data
+            window.show()
         
         # Connect logout signals
         def handle_logout():
             """Handle logout."""
             # Hide the windows
-            admin_window.hide()
-            user_window.hide()
+            for window in windows.values():
+                window.hide()
             
             # Show the login window
             login_window.show()
         
         # Connect signals
         login_window.login_successful.connect(handle_login_successful)
-        admin_window.logout_requested.connect(handle_logout)
-        user_window.logout_requested.connect(handle_logout)
         
         # Show the login window
         login_window.show()
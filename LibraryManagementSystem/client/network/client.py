@@ -2,16 +2,100 @@
 Client network module for the Library Management System.
 """
 
+import functools
 import socket
 import json
+import itertools
 import threading
-import time
-import ssl
+from typing import Optional
 from PyQt5.QtCore import QObject, pyqtSignal
 from utils.logger import get_logger
+from utils.protocol import HEADER, frame_message, parse_header, unpack_payload
 
 logger = get_logger(__name__)
 
+# TCP keepalive settings used to detect a vanished server
+_KEEPALIVE_IDLE = 30  # seconds before the first probe
+_KEEPALIVE_INTERVAL = 10  # seconds between probes
+_KEEPALIVE_COUNT = 3  # failed probes before the connection is dropped
+
+# Socket buffer size, large enough for a full book or user list
+_SOCKET_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# ALPN protocol offered when a client connects over TLS
+_TLS_ALPN_PROTOCOLS = ['lms/1']
+
+# Use the fastest installed JSON codec for messages: msgspec, then orjson,
+# then the standard library. All of them read and write the same wire format.
+try:
+    import msgspec
+    
+    class Request(msgspec.Struct):
+        """Schema for requests sent in the action/data form."""
+        action: str
+        data: dict
+        token: Optional[str]
+        request_id: int
+    
+    _ENC = msgspec.json.Encoder()
+    _DEC = msgspec.json.Decoder()
+    _dumps = _ENC.encode
+    _loads = _DEC.decode
+    _make_request = Request
+except ImportError:
+    try:
+        import orjson
+        _dumps = orjson.dumps
+        _loads = orjson.loads
+    except ImportError:
+        def _dumps(obj):
+            return json.dumps(obj).encode('utf-8')
+        
+        def _loads(data):
+            return json.loads(bytes(data))
+    
+    def _make_request(action, data, token, request_id):
+        return {'action': action, 'data': data, 'token': token, 'request_id': request_id}
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context():
+    """Build the TLS context once and share it across every connection."""
+    # Imported here so plain TCP clients never load OpenSSL
+    import ssl
+    
+    context = ssl.create_default_context()
+    context.set_alpn_protocols(_TLS_ALPN_PROTOCOLS)
+    return context
+
+@functools.lru_cache(maxsize=None)
+def _empty_request_prefix(action):
+    """Return the encoded start of a request with no data, up to the token."""
+    return b'{"action":' + _dumps(action) + b',"data":{},"token":'
+
+def _encode_request(action, data, token, request_id):
+    """
+    Encode a request given in the action/data form.
+    
+    Requests without data (ping, logout) only differ in token and request ID,
+    so they are spliced onto a cached encoded prefix for their action.
+    
+    Args:
+        action (str): The action to perform.
+        data (dict): The request data.
+        token (str): The authentication token.
+        request_id (int): The request ID.
+        
+    Returns:
+        bytes: The encoded request.
+    """
+    if data:
+        return _dumps(_make_request(action, data, token, request_id))
+    
+    return b''.join((
+        _empty_request_prefix(action), _dumps(token),
+        b',"request_id":', str(request_id).encode('ascii'), b'}',
+    ))
+
 class Client(QObject):
     """Client for communicating with the server."""
     
@@ -19,27 +103,84 @@ class Client(QObject):
     response_received = pyqtSignal(dict)
     connection_lost = pyqtSignal()
     
-    def __init__(self, host, port):
+    # Carries (callback, response) from the receive thread to the thread the client lives in
+    _callback_ready = pyqtSignal(object, object)
+    
+    def __new__(cls, host, port, use_tls=False, max_connections=1):
+        """
+        Create a client, or a pool of clients if more than one connection is asked for.
+        
+        Args:
+            host (str): The server host.
+            port (int): The server port.
+            use_tls (bool): Whether to connect over TLS.
+            max_connections (int): The number of connections to open.
+            
+        Returns:
+            Client or ClientPool: A single connection, or a pool of max_connections.
+        """
+        if max_connections > 1:
+            # Imported here because the pool is built from Clients
+            from .client_pool import ClientPool
+            return ClientPool(host, port, max_connections, use_tls)
+        
+        return super().__new__(cls)
+    
+    def __init__(self, host, port, use_tls=False, max_connections=1):
         """
         Initialize the client.
         
         Args:
             host (str): The server host.
             port (int): The server port.
+            use_tls (bool): Whether to connect over TLS.
+            max_connections (int): The number of connections to open; more than
+                one makes Client() return a ClientPool instead.
         """
         super().__init__()
         self.host = host
         self.port = port
+        self.use_tls = use_tls
+        self._tls_session = None
         self.socket = None
         self.connected = False
         self.token = None
         self.receive_thread = None
         self.callbacks = {}
+        self._id_counter = itertools.count(1)
+        self._connect_lock = threading.Lock()
+        
+        # Separate locks so callback bookkeeping never waits on a socket write
+        self._send_lock = threading.Lock()
+        self._cb_lock = threading.Lock()
+        
+        # Receive buffer reused for every message, grown when a message is larger
+        self._rx_buf = bytearray(65536)
+        
+        # One connection runs every callback, found by request ID
+        self._callback_ready.connect(self._run_callback)
     
     def connect(self):
         """
         Connect to the server.
         
+        Safe to call from several threads at once and when already connected;
+        only the first caller opens a socket.
+        
+        Returns:
+            bool: True if the connection was successful, False otherwise.
+        """
+        with self._connect_lock:
+            # Nothing to do if another caller already connected
+            if self.connected:
+                return True
+            
+            return self._connect()
+    
+    def _connect(self):
+        """
+        Open the socket and start the receive thread.
+        
         Returns:
             bool: True if the connection was successful, False otherwise.
         """
@@ -47,15 +188,30 @@ class Client(QObject):
             # Create a socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             
+            # Size the buffers before connecting so the TCP window can use them
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER_SIZE)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER_SIZE)
+            
             # Set a timeout for connection attempts
             self.socket.settimeout(5)
             
+            # Wrap the socket for TLS, resuming the previous session if there is one
+            if self.use_tls:
+                self.socket = _ssl_context().wrap_socket(
+                    self.socket, server_hostname=self.host, session=self._tls_session)
+            
             # Connect to the server
             self.socket.connect((self.host, self.port))
             
             # Reset the timeout for normal operation
             self.socket.settimeout(None)
             
+            # Send small requests immediately instead of waiting to coalesce them
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            # Detect half-open connections instead of blocking in recv forever
+            self._enable_keepalive()
+            
             self.connected = True
             
             # Start the receive thread
@@ -70,10 +226,33 @@ class Client(QObject):
             self.connected = False
             return False
     
+    def _enable_keepalive(self):
+        """Turn on TCP keepalive probes for the socket where supported."""
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            
+            # The tuning options are platform specific, so set only those available
+            options = (
+                ('TCP_KEEPIDLE', _KEEPALIVE_IDLE),
+                ('TCP_KEEPINTVL', _KEEPALIVE_INTERVAL),
+                ('TCP_KEEPCNT', _KEEPALIVE_COUNT),
+                ('TCP_USER_TIMEOUT', (_KEEPALIVE_IDLE + _KEEPALIVE_INTERVAL * _KEEPALIVE_COUNT) * 1000),
+            )
+            for name, value in options:
+                option = getattr(socket, name, None)
+                if option is not None:
+                    self.socket.setsockopt(socket.IPPROTO_TCP, option, value)
+        except OSError as e:
+            logger.warning(f"Could not enable TCP keepalive: {e}")
+    
     def disconnect(self):
         """Disconnect from the server."""
         if self.connected:
             try:
+                # Keep the TLS session so the next connect can resume it
+                if self.use_tls:
+                    self._tls_session = self.socket.session
+                
                 self.socket.close()
             except Exception as e:
                 logger.error(f"Error closing socket: {e}")
@@ -104,44 +283,34 @@ class Client(QObject):
                 callback = data
                 data = None
             
-            # Prepare the request based on input type
+            # Generate a request ID
+            request_id = next(self._id_counter)
+            
+            # Prepare and encode the request based on input type
             if isinstance(action_or_request, dict):
-                # If a complete request dict was provided
-                request = action_or_request.copy()
-                if 'token' not in request and self.token:
-                    request['token'] = self.token
+                # If a complete request dict was provided, copy it without any callback
+                request_data = {k: v for k, v in action_or_request.items() if k != 'callback'}
+                if 'token' not in request_data and self.token:
+                    request_data['token'] = self.token
+                request_data['request_id'] = request_id
+                action = request_data.get('action')
+                request_bytes = _dumps(request_data)
             else:
-                # If action and data were provided separately
-                request = {
-                    'action': action_or_request,
-                    'data': data or {},
-                    'token': self.token
-                }
-            
-            # Generate a request ID
-            request_id = str(int(time.time() * 1000))
-            request['request_id'] = request_id
+                # If action and data were provided separately, use the fixed schema
+                action = action_or_request
+                request_bytes = _encode_request(action, data, self.token, request_id)
             
             # Register the callback using the new method
             if callback:
                 self.register_callback(request_id, callback)
             
-            # Encode the request (exclude callback and any function objects from serialization)
-            request_data = {}
-            for k, v in request.items():
-                if k != 'callback' and not callable(v):
-                    request_data[k] = v
-            request_json = json.dumps(request_data)
-            request_bytes = request_json.encode('utf-8')
-            
-            # Send the request length first (4 bytes)
-            length_bytes = len(request_bytes).to_bytes(4, byteorder='big')
-            self.socket.sendall(length_bytes)
+            # Send the request length (4 bytes) and the request in one write,
+            # compressing large requests
+            frame = frame_message(request_bytes)
+            with self._send_lock:
+                self.socket.sendall(frame)
             
-            # Send the request
-            self.socket.sendall(request_bytes)
-            
-            logger.debug(f"Sent request: {request_data.get('action')}")
+            logger.debug(f"Sent request: {action}")
             return True
         except Exception as e:
             logger.error(f"Error sending request: {e}")
@@ -189,21 +358,21 @@ class Client(QObject):
         Register a callback for a specific request ID.
         
         Args:
-            request_id (str): The request ID.
+            request_id (int): The request ID.
             callback (callable): The callback function.
         """
-        self.callbacks[request_id] = callback
-        
-        # Connect a one-time handler for this request
-        def handle_response(response):
-            if response.get('request_id') == request_id:
-                # Call the callback
-                callback(response)
-                # Disconnect this handler
-                self.response_received.disconnect(handle_response)
+        with self._cb_lock:
+            self.callbacks[request_id] = callback
+    
+    def _run_callback(self, callback, response):
+        """
+        Call a request's callback with its response, on the client's thread.
         
-        # Connect the handler
-        self.response_received.connect(handle_response)
+        Args:
+            callback (callable): The callback registered for the request.
+            response (dict): The response.
+        """
+        callback(response)
     
     def ping(self, callback=None):
         """
@@ -450,11 +619,11 @@ class Client(QObject):
         while self.connected:
             try:
                 # Receive the response length first (4 bytes)
-                length_bytes = self._receive_exactly(4)
+                length_bytes = self._receive_exactly(HEADER.size)
                 if not length_bytes:
                     break
                 
-                response_length = int.from_bytes(length_bytes, byteorder='big')
+                response_length, compressed = parse_header(length_bytes)
                 
                 # Receive the response
                 response_bytes = self._receive_exactly(response_length)
@@ -462,8 +631,7 @@ class Client(QObject):
                     break
                 
                 # Decode the response
-                response_json = response_bytes.decode('utf-8')
-                response = json.loads(response_json)
+                response = _loads(unpack_payload(response_bytes, compressed))
                 
                 # Handle the response
                 self._handle_response(response)
@@ -476,20 +644,29 @@ class Client(QObject):
         """
         Receive exactly n bytes from the socket.
         
+        The bytes are read into the shared receive buffer, so the returned view
+        is only valid until the next call.
+        
         Args:
             n (int): The number of bytes to receive.
             
         Returns:
-            bytes: The received bytes, or None if an error occurred.
+            memoryview: The received bytes, or None if an error occurred.
         """
         try:
-            data = b''
-            while len(data) < n:
-                chunk = self.socket.recv(n - len(data))
-                if not chunk:
+            # Grow the shared buffer once if this message doesn't fit
+            if n > len(self._rx_buf):
+                self._rx_buf = bytearray(n)
+            
+            # Read straight into the shared buffer instead of joining chunks
+            view = memoryview(self._rx_buf)[:n]
+            received = 0
+            while received < n:
+                count = self.socket.recv_into(view[received:])
+                if not count:
                     return None
-                data += chunk
-            return data
+                received += count
+            return view
         except Exception as e:
             logger.error(f"Error receiving data: {e}")
             self.connected = False
@@ -503,18 +680,24 @@ class Client(QObject):
             response (dict): The response.
         """
         try:
-            # Extract the request ID
-            request_id = response.get('request_id')
-            
-            # Emit the response signal to be handled in the main thread
-            self.response_received.emit(response)
-            
-            # Handle authentication responses
+            # Handle authentication responses before any callback sees them
             if response.get('action') == 'login' and response.get('success'):
                 self.token = response.get('data', {}).get('token')
                 logger.info("Logged in successfully")
             elif response.get('action') == 'logout' and response.get('success'):
                 self.token = None
                 logger.info("Logged out successfully")
+            
+            # Take the request's callback with a single lookup
+            request_id = response.get('request_id')
+            with self._cb_lock:
+                callback = self.callbacks.pop(request_id, None)
+            
+            # Hand the callback to the main thread along with its response
+            if callback:
+                self._callback_ready.emit(callback, response)
+            
+            # Emit the response signal for any other listeners
+            self.response_received.emit(response)
         except Exception as e:
             logger.error(f"Error handling response: {e}")
@@ -0,0 +1,194 @@
+"""
+Client connection pool for the Library Management System.
+"""
+
+import itertools
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from utils.logger import get_logger
+from .client import Client
+
+logger = get_logger(__name__)
+
+# Actions that only read, so they may overtake each other on separate connections.
+# Everything else, including login and logout, goes through the primary connection.
+_READ_ACTIONS = frozenset((
+    'ping', 'book_get', 'book_get_by_isbn', 'book_get_all', 'book_search',
+    'book_get_transactions', 'user_get', 'user_get_by_username', 'user_get_all',
+    'user_get_transactions',
+))
+
+class ClientPool(QObject):
+    """Spreads requests over several connections to the server."""
+    
+    # Define signals for thread-safe communication
+    response_received = pyqtSignal(dict)
+    connection_lost = pyqtSignal()
+    
+    # Request helpers only need send_request and token, so share Client's
+    login = Client.login
+    logout = Client.logout
+    ping = Client.ping
+    get_books = Client.get_books
+    get_book = Client.get_book
+    create_book = Client.create_book
+    update_book = Client.update_book
+    delete_book = Client.delete_book
+    get_users = Client.get_users
+    get_user = Client.get_user
+    create_user = Client.create_user
+    update_user = Client.update_user
+    delete_user = Client.delete_user
+    
+    def __init__(self, host, port, max_connections=4, use_tls=False):
+        """
+        Initialize the client pool.
+        
+        Args:
+            host (str): The server host.
+            port (int): The server port.
+            max_connections (int): The number of connections to open.
+            use_tls (bool): Whether to connect over TLS.
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.clients = [Client(host, port, use_tls) for _ in range(max(1, max_connections))]
+        self._connect_lock = threading.Lock()
+        
+        # Number requests from one counter so request IDs are unique across the pool
+        self._id_counter = itertools.count(1)
+        for client in self.clients:
+            client._id_counter = self._id_counter
+        
+        # Writes sent on the primary connection that are still awaiting a response
+        self._writes_in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        
+        # Forward every connection's signals through the pool
+        for client in self.clients:
+            client.response_received.connect(self.response_received)
+            client.connection_lost.connect(self.connection_lost)
+    
+    @property
+    def primary(self):
+        """Client: The connection that owns the login session."""
+        return self.clients[0]
+    
+    @property
+    def token(self):
+        """str: The authentication token of the current session."""
+        return self.primary.token
+    
+    @property
+    def connected(self):
+        """bool: True if the primary connection is open."""
+        return self.primary.connected
+    
+    def connect(self):
+        """
+        Connect every pooled client to the server.
+        
+        Returns:
+            bool: True if the primary connection was successful, False otherwise.
+        """
+        with self._connect_lock:
+            # The pool is unusable without its primary connection
+            if not self.primary.connect():
+                return False
+            
+            # Extra connections are best effort; requests skip any that failed
+            for client in self.clients[1:]:
+                client.connect()
+            
+            return True
+    
+    def disconnect(self):
+        """Disconnect every pooled client from the server."""
+        for client in self.clients:
+            client.disconnect()
+        
+        # Writes still in flight will never be answered
+        with self._in_flight_lock:
+            self._writes_in_flight = 0
+    
+    def send_request(self, action_or_request, data=None, callback=None):
+        """
+        Send a request, spreading reads over the least busy connections.
+        
+        The server answers each connection's requests in order, so everything
+        but reads goes through the primary connection, and so do reads sent
+        while a write there is unanswered: a read never overtakes a write
+        sent before it.
+        
+        Args:
+            action_or_request (str or dict): The action to perform or a complete request dict.
+            data (dict, optional): The data to send if action_or_request is a string.
+            callback (callable, optional): A callback function to call when a response is received.
+        
+        Returns:
+            bool: True if the request was sent successfully, False otherwise.
+        """
+        # Handle the case where callback is passed as the second argument
+        if callable(data) and callback is None:
+            callback = data
+            data = None
+        
+        # Work out the action to decide which connection may carry the request
+        if isinstance(action_or_request, dict):
+            action = action_or_request.get('action')
+        else:
+            action = action_or_request
+        
+        if action not in _READ_ACTIONS:
+            return self._send_write(action_or_request, data, callback)
+        
+        # Reads queue behind an unanswered write on the primary connection
+        with self._in_flight_lock:
+            behind_write = self._writes_in_flight > 0
+        
+        if behind_write:
+            return self.primary.send_request(action_or_request, data, callback)
+        
+        # Pick the open connection with the fewest requests awaiting a response
+        open_clients = [client for client in self.clients if client.connected]
+        if not open_clients:
+            logger.warning("Not connected to server")
+            return False
+        
+        client = min(open_clients, key=lambda c: len(c.callbacks))
+        
+        # Requests on secondary connections carry the primary's session token
+        client.token = self.primary.token
+        
+        return client.send_request(action_or_request, data, callback)
+    
+    def _send_write(self, action_or_request, data, callback):
+        """
+        Send a write on the primary connection, counting it until it is answered.
+        
+        Args:
+            action_or_request (str or dict): The action to perform or a complete request dict.
+            data (dict): The data to send if action_or_request is a string.
+            callback (callable): The caller's callback, or None.
+        
+        Returns:
+            bool: True if the request was sent successfully, False otherwise.
+        """
+        def answered(response):
+            with self._in_flight_lock:
+                self._writes_in_flight = max(0, self._writes_in_flight - 1)
+            
+            if callback:
+                callback(response)
+        
+        with self._in_flight_lock:
+            self._writes_in_flight += 1
+        
+        if self.primary.send_request(action_or_request, data, answered):
+            return True
+        
+        # No response will come for a write that was never sent
+        with self._in_flight_lock:
+            self._writes_in_flight = max(0, self._writes_in_flight - 1)
+        return False
@@ -0,0 +1,46 @@
+"""
+Background request worker for the Library Management System client.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class RequestWorker(QObject):
+    """Sends client requests from a worker thread instead of the GUI thread."""
+    
+    # Emitted with (token, response) when the server answers a request
+    response_ready = pyqtSignal(int, object)
+    
+    # Emitted with the token of a request that could not be sent
+    request_failed = pyqtSignal(int)
+    
+    def __init__(self, client):
+        """
+        Initialize the request worker.
+        
+        Args:
+            client: The client instance.
+        """
+        super().__init__()
+        
+        self.client = client
+    
+    @pyqtSlot(int, str, object)
+    def do_request(self, token, endpoint, data):
+        """
+        Send a request to the server.
+        
+        Args:
+            token (int): The caller's token identifying this request.
+            endpoint (str): The action to perform.
+            data (dict): The request data.
+        """
+        def deliver(response):
+            # Hand the response back to whichever thread owns the receiver
+            self.response_ready.emit(token, response)
+        
+        if not self.client.send_request(endpoint, data, deliver):
+            logger.warning(f"Request {endpoint} could not be sent")
+            self.request_failed.emit(token)
@@ -2,32 +2,82 @@
 Database connection manager for the Library Management System.
 """
 
+import atexit
 import sqlite3
+import sys
 import threading
+import time
 import os
-import importlib.util
-
-# Try absolute imports first (when running as a package)
-try:
-    from LibraryManagementSystem.utils.logger import get_logger
-    from LibraryManagementSystem.utils.config import DATABASE_PATH, DATABASE_TIMEOUT
-except ImportError:
-    # Fall back to relative imports (when running directly)
-    try:
-        from utils.logger import get_logger
-        from utils.config import DATABASE_PATH, DATABASE_TIMEOUT
-    except ImportError:
-        import sys
-        # Add project root to path
-        sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        from utils.logger import get_logger
-        from utils.config import DATABASE_PATH, DATABASE_TIMEOUT
+from collections import OrderedDict
+
+# Make the project root importable when this module is loaded as a script
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils.logger import get_logger
+from utils.config import DATABASE_PATH, DATABASE_TIMEOUT
 
 logger = get_logger(__name__)
 
 # Thread-local storage for database connections
 local = threading.local()
 
+# Per-connection tuning: NORMAL sync is safe under WAL and saves an fsync per
+# commit, and the page cache (64 MB) and memory map (256 MB) avoid read() calls
+_CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -64000',
+    'PRAGMA mmap_size = 268435456',
+)
+
+# Page size for new databases, in bytes
+_PAGE_SIZE = 4096
+
+# How often a long-running process refreshes query planner statistics
+_OPTIMIZE_INTERVAL = 4 * 60 * 60  # seconds
+
+# Database file already switched to WAL; the mode is stored in the file itself
+_wal_path = None
+
+# Database directory already created
+_ready_dir = None
+
+# Indexes replaced by wider ones in _INDEXES
+_OBSOLETE_INDEXES = ('idx_tx_book_status', 'idx_tx_user_status')
+
+# Recent results of read-only queries: (sql, params) -> (time cached, rows)
+_query_cache = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# Bumped by clear_query_cache(), so reads that raced a write don't cache their rows
+_query_cache_generation = 0
+
+# Number of query results kept, and how long each stays valid
+_QUERY_CACHE_SIZE = 256
+_QUERY_CACHE_TTL = 5  # seconds
+
+# Bound once so opening a connection skips the module attribute lookups
+_connect = sqlite3.connect
+_current_thread = threading.current_thread
+_log_debug = logger.debug
+
+# Indexes backing the loan lookups (newest first), the overdue sweep and the
+# title/author ordering and searches
+_INDEXES = (
+    ('idx_tx_book_status_date',
+     'CREATE INDEX IF NOT EXISTS idx_tx_book_status_date ON transactions (book_id, status, borrow_date DESC)'),
+    ('idx_tx_user_status_date',
+     'CREATE INDEX IF NOT EXISTS idx_tx_user_status_date ON transactions (user_id, status, borrow_date DESC)'),
+    ('idx_tx_status_due',
+     'CREATE INDEX IF NOT EXISTS idx_tx_status_due ON transactions (status, due_date)'),
+    ('idx_books_title',
+     'CREATE INDEX IF NOT EXISTS idx_books_title ON books (title COLLATE NOCASE)'),
+    ('idx_books_author',
+     'CREATE INDEX IF NOT EXISTS idx_books_author ON books (author COLLATE NOCASE)'),
+)
+
 def get_connection():
     """
     Get a database connection for the current thread.
@@ -35,28 +85,207 @@ def get_connection():
     Returns:
         sqlite3.Connection: A database connection.
     """
-    if not hasattr(local, 'connection'):
-        # Create database directory if it doesn't exist
-        os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-        
-        # Create a new connection for this thread
-        local.connection = sqlite3.connect(DATABASE_PATH, timeout=DATABASE_TIMEOUT)
-        local.connection.row_factory = sqlite3.Row  # Return rows as dictionaries
-        
-        # Enable foreign keys
-        local.connection.execute('PRAGMA foreign_keys = ON')
-        
-        logger.debug(f"Created new database connection for thread {threading.current_thread().name}")
+    conn = getattr(local, 'connection', None)
+    if conn is not None:
+        return conn
+    
+    global _wal_path, _ready_dir
+    
+    # Create database directory if it doesn't exist; only checked once per directory
+    db_dir = os.path.dirname(DATABASE_PATH)
+    if _ready_dir != db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+        _ready_dir = db_dir
+    
+    # Create a new connection for this thread; transactions are opened explicitly with begin()
+    conn = _connect(DATABASE_PATH, timeout=DATABASE_TIMEOUT, cached_statements=256,
+                    isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
     
-    return local.connection
+    # Enable foreign keys
+    conn.execute('PRAGMA foreign_keys = ON')
+    
+    # Use WAL so readers don't block on the writer; only needed once per file
+    if _wal_path != DATABASE_PATH:
+        conn.execute('PRAGMA journal_mode = WAL')
+        _wal_path = DATABASE_PATH
+    
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    
+    local.connection = conn
+    _log_debug(f"Created new database connection for thread {_current_thread().name}")
+    
+    return conn
 
 def close_connection():
     """Close the database connection for the current thread."""
-    if hasattr(local, 'connection'):
+    if getattr(local, 'connection', None) is not None:
+        # Refresh planner statistics that went stale while the connection was open
+        try:
+            local.connection.execute('PRAGMA optimize')
+        except Exception as e:
+            logger.warning(f"Error optimizing database: {e}")
+        
         local.connection.close()
         delattr(local, 'connection')
         logger.debug(f"Closed database connection for thread {threading.current_thread().name}")
 
+# Connections stay open between operations; close the main thread's on exit
+atexit.register(close_connection)
+
+def begin():
+    """Start a write transaction on the current thread's connection, taking the write lock up front."""
+    get_connection().execute('BEGIN IMMEDIATE')
+
+def commit():
+    """Commit the current thread's open transaction, if any."""
+    conn = get_connection()
+    if conn.in_transaction:
+        conn.execute('COMMIT')
+
+def rollback():
+    """Roll back the current thread's open transaction, if any."""
+    conn = get_connection()
+    if conn.in_transaction:
+        conn.execute('ROLLBACK')
+
+def cached_rows(sql, params=()):
+    """
+    Run a read-only query, reusing its rows if it ran within the last few seconds.
+    
+    Writers must call clear_query_cache() after committing.
+    
+    Args:
+        sql (str): The SELECT statement.
+        params (tuple, optional): The statement parameters.
+        
+    Returns:
+        list: The result rows as tuples.
+    """
+    key = (sql, params)
+    now = time.monotonic()
+    
+    with _query_cache_lock:
+        generation = _query_cache_generation
+        entry = _query_cache.get(key)
+        if entry and now - entry[0] < _QUERY_CACHE_TTL:
+            _query_cache.move_to_end(key)
+            return entry[1]
+    
+    cursor = get_connection().cursor()
+    cursor.row_factory = None
+    
+    # fetchall steps through the whole result in C; arraysize only batches fetchmany
+    rows = cursor.execute(sql, params).fetchall()
+    
+    with _query_cache_lock:
+        # A write committed while the query ran; its rows may predate it
+        if generation != _query_cache_generation:
+            return rows
+        
+        _query_cache[key] = (now, rows)
+        _query_cache.move_to_end(key)
+        
+        # Evict the least recently used results
+        while len(_query_cache) > _QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    
+    return rows
+
+def clear_query_cache():
+    """Forget all cached query results, after a write."""
+    global _query_cache_generation
+    
+    with _query_cache_lock:
+        _query_cache_generation += 1
+        _query_cache.clear()
+
+def _optimize_periodically(interval):
+    """
+    Refresh query planner statistics, then schedule the next refresh.
+    
+    Args:
+        interval (float): Seconds until the next refresh.
+    """
+    try:
+        get_connection().execute('PRAGMA optimize')
+    except Exception as e:
+        logger.error(f"Error optimizing database: {e}")
+    finally:
+        # Each timer runs on a new thread, so don't leave its connection behind
+        close_connection()
+    
+    schedule_optimize(interval)
+
+def schedule_optimize(interval=_OPTIMIZE_INTERVAL):
+    """
+    Run PRAGMA optimize in the background every interval seconds.
+    
+    Args:
+        interval (float, optional): Seconds between runs.
+    
+    Returns:
+        threading.Timer: The timer for the next run.
+    """
+    timer = threading.Timer(interval, _optimize_periodically, args=(interval,))
+    timer.daemon = True
+    timer.start()
+    return timer
+
+def _create_book_search_index(cursor):
+    """
+    Create the books_fts full-text index and the triggers that maintain it.
+    
+    Args:
+        cursor (sqlite3.Cursor): The cursor to execute the statements on.
+    
+    Raises:
+        sqlite3.OperationalError: If SQLite was built without FTS5.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'")
+    exists = cursor.fetchone() is not None
+    
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, isbn, category, description,
+        content='books', content_rowid='book_id'
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS books_fts_insert
+    AFTER INSERT ON books
+    BEGIN
+        INSERT INTO books_fts (rowid, title, author, isbn, category, description)
+        VALUES (NEW.book_id, NEW.title, NEW.author, NEW.isbn, NEW.category, NEW.description);
+    END;
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS books_fts_delete
+    AFTER DELETE ON books
+    BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, isbn, category, description)
+        VALUES ('delete', OLD.book_id, OLD.title, OLD.author, OLD.isbn, OLD.category, OLD.description);
+    END;
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS books_fts_update
+    AFTER UPDATE OF title, author, isbn, category, description ON books
+    BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, isbn, category, description)
+        VALUES ('delete', OLD.book_id, OLD.title, OLD.author, OLD.isbn, OLD.category, OLD.description);
+        INSERT INTO books_fts (rowid, title, author, isbn, category, description)
+        VALUES (NEW.book_id, NEW.title, NEW.author, NEW.isbn, NEW.category, NEW.description);
+    END;
+    ''')
+    
+    # Index books that were added before the index existed
+    if not exists:
+        cursor.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+
 def initialize_database():
     """Initialize the database with the required tables."""
     try:
@@ -66,9 +295,20 @@ def initialize_database():
         print(f"Current working directory: {os.getcwd()}")
         print("-"*80)
         
+        # Results cached from another database must not leak into this one
+        clear_query_cache()
+        
         conn = get_connection()
         cursor = conn.cursor()
         
+        # The page size can't change in WAL mode, so rebuild in rollback mode if needed
+        if cursor.execute('PRAGMA page_size').fetchone()[0] != _PAGE_SIZE:
+            print(f"Setting page size to {_PAGE_SIZE} bytes...")
+            cursor.execute('PRAGMA journal_mode = DELETE')
+            cursor.execute(f'PRAGMA page_size = {_PAGE_SIZE}')
+            cursor.execute('VACUUM')
+            cursor.execute('PRAGMA journal_mode = WAL')
+        
         print("Creating users table...")
         # Create users table
         cursor.execute('''
@@ -124,6 +364,19 @@ def initialize_database():
         ''')
         print("✓ Transactions table created successfully")
         
+        print("Creating indexes...")
+        # Remember which indexes exist so new ones can be analyzed below
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing_indexes = {row[0] for row in cursor.fetchall()}
+        
+        for name, statement in _INDEXES:
+            cursor.execute(statement)
+        
+        # Drop indexes that a wider index above now covers
+        for name in _OBSOLETE_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS {name}')
+        print("✓ Indexes created successfully")
+        
         print("Creating database triggers...")
         # Create a trigger to update the 'updated_at' field in users table
         cursor.execute('''
@@ -156,18 +409,31 @@ def initialize_database():
         END;
         ''')
         
-        # Create a trigger to update the 'available' field in books table when a book is returned
+        # Create a trigger to update the 'available' field in books table when a book is returned,
+        # whether or not it was overdue; recreated so databases with the older,
+        # borrowed-only trigger pick up the change
+        cursor.execute('DROP TRIGGER IF EXISTS update_books_available_on_return')
         cursor.execute('''
-        CREATE TRIGGER IF NOT EXISTS update_books_available_on_return
+        CREATE TRIGGER update_books_available_on_return
         AFTER UPDATE ON transactions
         FOR EACH ROW
-        WHEN NEW.status = 'returned' AND OLD.status = 'borrowed'
+        WHEN NEW.status = 'returned' AND OLD.status IN ('borrowed', 'overdue')
         BEGIN
             UPDATE books SET available = available + 1 WHERE book_id = NEW.book_id;
         END;
         ''')
         print("✓ Database triggers created successfully")
         
+        print("Creating book search index...")
+        # Full-text index over the searchable book fields, kept in sync by triggers
+        try:
+            _create_book_search_index(cursor)
+            print("✓ Book search index created successfully")
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 fall back to LIKE searches
+            print(f"! Book search index unavailable: {e}")
+            logger.warning(f"Book search index unavailable: {e}")
+        
         print("Inserting default admin user...")
         # Insert admin user if not exists
         cursor.execute('''
@@ -177,6 +443,14 @@ def initialize_database():
         print("✓ Default admin user created successfully")
         
         conn.commit()
+        
+        # Gather statistics for newly created indexes so the planner uses them
+        if any(name not in existing_indexes for name, _ in _INDEXES):
+            cursor.execute('ANALYZE')
+        else:
+            # Otherwise only refresh statistics that have gone stale
+            cursor.execute('PRAGMA optimize = 0x10002')
+        
         print("-"*80)
         print("DATABASE INITIALIZATION COMPLETED SUCCESSFULLY")
         print("="*80)
@@ -187,8 +461,6 @@ def initialize_database():
         print("!"*80)
         logger.error(f"Error initializing database: {e}")
         raise
-    finally:
-        close_connection()
 
 if __name__ == '__main__':
     # Execute database initialization when script is run directly
@@ -2,13 +2,26 @@
 Book model for the Library Management System.
 """
 
+import json
+from operator import attrgetter
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Book fields in column order, shared by the slots, to_dict and rows_to_json
+_FIELDS = ('book_id', 'title', 'author', 'isbn', 'publisher', 'publication_year',
+           'category', 'description', 'quantity', 'available', 'created_at',
+           'updated_at')
+
+# Reads every field of a book in one call
+_get_fields = attrgetter(*_FIELDS)
+
 class Book:
     """Book model representing a library book."""
     
+    # Fixed attribute set: no per-instance __dict__ for the many rows loaded at once
+    __slots__ = _FIELDS
+    
     def __init__(self, book_id=None, title=None, author=None, isbn=None,
                  publisher=None, publication_year=None, category=None,
                  description=None, quantity=1, available=1,
@@ -72,6 +85,19 @@ class Book:
             updated_at=row['updated_at']
         )
     
+    @classmethod
+    def from_tuple(cls, row):
+        """
+        Create a Book object from a plain database tuple.
+        
+        Args:
+            row (tuple): The book columns in constructor order.
+            
+        Returns:
+            Book: A Book object.
+        """
+        return cls(*row)
+    
     def to_dict(self):
         """
         Convert the Book object to a dictionary.
@@ -79,20 +105,33 @@ class Book:
         Returns:
             dict: A dictionary representation of the Book object.
         """
-        return {
-            'book_id': self.book_id,
-            'title': self.title,
-            'author': self.author,
-            'isbn': self.isbn,
-            'publisher': self.publisher,
-            'publication_year': self.publication_year,
-            'category': self.category,
-            'description': self.description,
-            'quantity': self.quantity,
-            'available': self.available,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+        return dict(zip(_FIELDS, _get_fields(self)))
+    
+    @staticmethod
+    def to_dict_batch(books):
+        """
+        Convert many Book objects to dictionaries in one pass.
+        
+        Args:
+            books (iterable): The Book objects.
+            
+        Returns:
+            list: The dictionaries, as to_dict would produce them.
+        """
+        return [dict(zip(_FIELDS, fields)) for fields in map(_get_fields, books)]
+    
+    @staticmethod
+    def rows_to_json(rows):
+        """
+        Serialize database tuples straight to JSON without creating Book objects.
+        
+        Args:
+            rows (iterable): Book rows in constructor order, e.g. a cursor.
+            
+        Returns:
+            str: A JSON array of book dictionaries, as to_dict would produce.
+        """
+        return json.dumps([dict(zip(_FIELDS, row)) for row in rows])
     
     def is_available(self):
         """
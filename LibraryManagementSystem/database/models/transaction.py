@@ -3,18 +3,32 @@ Transaction model for the Library Management System.
 """
 
 from datetime import datetime, timedelta
+from operator import attrgetter
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Transaction fields in column order, shared by the slots and to_dict
+_FIELDS = ('transaction_id', 'user_id', 'book_id', 'borrow_date', 'due_date',
+           'return_date', 'status')
+
+# Reads every field of a transaction in one call
+_get_fields = attrgetter(*_FIELDS)
+
 class Transaction:
     """Transaction model representing a book borrowing/returning transaction."""
     
+    # Fixed attribute set: no per-instance __dict__ for the many rows loaded at once
+    __slots__ = _FIELDS
+    
     # Transaction status constants
     STATUS_BORROWED = 'borrowed'
     STATUS_RETURNED = 'returned'
     STATUS_OVERDUE = 'overdue'
     
+    # Statuses of loans whose copy is still out; an overdue loan can still be returned
+    OPEN_STATUSES = (STATUS_BORROWED, STATUS_OVERDUE)
+    
     def __init__(self, transaction_id=None, user_id=None, book_id=None,
                  borrow_date=None, due_date=None, return_date=None,
                  status=None):
@@ -62,6 +76,32 @@ class Transaction:
             status=row['status']
         )
     
+    @classmethod
+    def from_tuple(cls, row):
+        """
+        Create a Transaction object from a plain database tuple.
+        
+        Args:
+            row (tuple): The transaction columns in constructor order.
+            
+        Returns:
+            Transaction: A Transaction object.
+        """
+        return cls(*row)
+    
+    @classmethod
+    def from_rows_bulk(cls, rows):
+        """
+        Create Transaction objects from plain database tuples.
+        
+        Args:
+            rows (iterable): Transaction rows in constructor order.
+            
+        Returns:
+            list: A list of Transaction objects.
+        """
+        return list(map(cls.from_tuple, rows))
+    
     def to_dict(self):
         """
         Convert the Transaction object to a dictionary.
@@ -69,15 +109,7 @@ class Transaction:
         Returns:
             dict: A dictionary representation of the Transaction object.
         """
-        return {
-            'transaction_id': self.transaction_id,
-            'user_id': self.user_id,
-            'book_id': self.book_id,
-            'borrow_date': self.borrow_date,
-            'due_date': self.due_date,
-            'return_date': self.return_date,
-            'status': self.status
-        }
+        return dict(zip(_FIELDS, _get_fields(self)))
     
     @staticmethod
     def calculate_due_date(borrow_date, loan_period_days=14):
@@ -2,14 +2,26 @@
 User model for the Library Management System.
 """
 
+from operator import attrgetter
 from utils.logger import get_logger
 from utils.security import hash_password, verify_password
 
 logger = get_logger(__name__)
 
+# Fields returned by to_dict, in column order; the password is only added on request
+_PUBLIC_FIELDS = ('user_id', 'username', 'role', 'full_name', 'email', 'phone',
+                  'address', 'created_at', 'updated_at')
+
+# Reads every public field of a user in one call
+_get_public_fields = attrgetter(*_PUBLIC_FIELDS)
+
 class User:
     """User model representing a library system user."""
     
+    # Fixed attribute set: no per-instance __dict__ for the many rows loaded at once
+    __slots__ = ('user_id', 'username', 'password', 'role', 'full_name', 'email', 'phone',
+                 'address', 'created_at', 'updated_at')
+    
     def __init__(self, user_id=None, username=None, password=None, role=None, 
                  full_name=None, email=None, phone=None, address=None,
                  created_at=None, updated_at=None):
@@ -66,6 +78,32 @@ class User:
             updated_at=row['updated_at']
         )
     
+    @classmethod
+    def from_tuple(cls, row):
+        """
+        Create a User object from a plain database tuple.
+        
+        Args:
+            row (tuple): The user columns in constructor order.
+            
+        Returns:
+            User: A User object.
+        """
+        return cls(*row)
+    
+    @classmethod
+    def from_rows_bulk(cls, rows):
+        """
+        Create User objects from plain database tuples.
+        
+        Args:
+            rows (iterable): User rows in constructor order.
+            
+        Returns:
+            list: A list of User objects.
+        """
+        return list(map(cls.from_tuple, rows))
+    
     def to_dict(self, include_password=False):
         """
         Convert the User object to a dictionary.
@@ -76,23 +114,26 @@ class User:
         Returns:
             dict: A dictionary representation of the User object.
         """
-        result = {
-            'user_id': self.user_id,
-            'username': self.username,
-            'role': self.role,
-            'full_name': self.full_name,
-            'email': self.email,
-            'phone': self.phone,
-            'address': self.address,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+        result = dict(zip(_PUBLIC_FIELDS, _get_public_fields(self)))
         
         if include_password:
             result['password'] = self.password
         
         return result
     
+    @staticmethod
+    def to_dict_batch(users):
+        """
+        Convert many User objects to dictionaries, without passwords, in one pass.
+        
+        Args:
+            users (iterable): The User objects.
+            
+        Returns:
+            list: The dictionaries, as to_dict would produce them.
+        """
+        return [dict(zip(_PUBLIC_FIELDS, fields)) for fields in map(_get_public_fields, users)]
+    
     def set_password(self, password):
         """
         Set the user's password (hashed).
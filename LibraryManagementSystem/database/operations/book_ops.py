@@ -3,12 +3,167 @@ Book database operations for the Library Management System.
 """
 
 import sqlite3
-from ..db_manager import get_connection, close_connection
+from contextlib import contextmanager
+from ..db_manager import get_connection, begin, commit, rollback, cached_rows, clear_query_cache
 from ..models.book import Book
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Book columns in model order; listed explicitly so rows unpack straight into Book
+_BOOK_COLUMNS = ('book_id, title, author, isbn, publisher, publication_year, category, '
+                 'description, quantity, available, created_at, updated_at')
+
+# Rows read per batch when streaming the catalog
+_FETCH_SIZE = 1000
+
+# INSERT ... RETURNING needs SQLite 3.35; older libraries fall back to lastrowid
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# SQL statements, defined once so sqlite3 can reuse their prepared forms
+_SQL_INSERT_BOOK = '''
+INSERT INTO books (title, author, isbn, publisher, publication_year, category, description, quantity, available)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_BOOK_RETURNING_ID = _SQL_INSERT_BOOK + 'RETURNING book_id'
+_SQL_INSERT_BOOK_RETURNING_ROW = _SQL_INSERT_BOOK + f'RETURNING {_BOOK_COLUMNS}'
+_SQL_GET_BOOK_BY_ID = f'SELECT {_BOOK_COLUMNS} FROM books WHERE book_id = ?'
+_SQL_GET_BOOKS_PAGE = f'SELECT {_BOOK_COLUMNS} FROM books WHERE book_id > ? ORDER BY book_id LIMIT ?'
+_SQL_GET_BOOK_BY_ISBN = f'SELECT {_BOOK_COLUMNS} FROM books WHERE isbn = ?'
+_SQL_GET_ALL_BOOKS = f'SELECT {_BOOK_COLUMNS} FROM books ORDER BY title COLLATE NOCASE'
+_SQL_GET_BOOK_STOCK = 'SELECT quantity, available FROM books WHERE book_id = ?'
+_SQL_BOOK_EXISTS = 'SELECT 1 FROM books WHERE book_id = ?'
+_SQL_DELETE_BOOK = '''
+DELETE FROM books
+WHERE book_id = ?
+AND NOT EXISTS (SELECT 1 FROM transactions
+                WHERE book_id = books.book_id AND status IN ('borrowed', 'overdue'))
+'''
+
+# UPDATE statements by (changed fields, quantity changed), filled by _update_sql
+_UPDATE_SQL_CACHE = {}
+
+# Fields books can be searched by
+_SEARCH_FIELDS = frozenset(('title', 'author', 'isbn', 'category'))
+
+# Substring search for each field, built once at import
+_SQL_SEARCH_LIKE = {
+    field: f'SELECT {_BOOK_COLUMNS} FROM books WHERE {field} LIKE ? ORDER BY title COLLATE NOCASE'
+    for field in _SEARCH_FIELDS
+}
+
+# One page of a substring search, with the total match count on every row
+_SQL_SEARCH_LIKE_PAGED = {
+    field: f'''
+    SELECT {_BOOK_COLUMNS}, COUNT(*) OVER () FROM books
+    WHERE {field} LIKE ?
+    ORDER BY title COLLATE NOCASE
+    LIMIT ? OFFSET ?
+    '''
+    for field in _SEARCH_FIELDS
+}
+
+# Book columns qualified for joins against the search index
+_FTS_BOOK_COLUMNS = ', '.join('b.' + column for column in _BOOK_COLUMNS.split(', '))
+
+# Full-text search over the books_fts index, best matches first
+_SQL_SEARCH_FTS = f'''
+SELECT {_FTS_BOOK_COLUMNS}
+FROM books_fts JOIN books b ON b.book_id = books_fts.rowid
+WHERE books_fts MATCH ?
+ORDER BY bm25(books_fts), b.title COLLATE NOCASE
+'''
+
+# One page of a full-text search; bm25 can't share a query with a window function,
+# so the total is counted separately
+_SQL_SEARCH_FTS_PAGED = f'''
+SELECT {_FTS_BOOK_COLUMNS}
+FROM books_fts JOIN books b ON b.book_id = books_fts.rowid
+WHERE books_fts MATCH ?
+ORDER BY bm25(books_fts), b.title COLLATE NOCASE
+LIMIT ? OFFSET ?
+'''
+_SQL_COUNT_FTS = 'SELECT COUNT(*) FROM books_fts WHERE books_fts MATCH ?'
+
+# Fields searched through the full-text index; ISBNs are matched as substrings
+_FTS_FIELDS = ('title', 'author', 'category')
+
+def _update_sql(fields, with_quantity):
+    """
+    Get the UPDATE statement for a set of changed book fields.
+    
+    Statements are built once per combination of fields and cached.
+    
+    Args:
+        fields (tuple): The names of the changed fields, in update_book's order.
+        with_quantity (bool): Whether the quantity is changed as well.
+        
+    Returns:
+        str: The UPDATE statement.
+    """
+    key = (fields, with_quantity)
+    sql = _UPDATE_SQL_CACHE.get(key)
+    if sql is None:
+        assignments = [f'{field} = ?' for field in fields]
+        where_clause = 'book_id = ?'
+        
+        if with_quantity:
+            # Keep borrowed copies out on loan and refuse to shrink below them
+            assignments.append('quantity = ?, available = ? - (quantity - available)')
+            where_clause += ' AND quantity - available <= ?'
+        
+        sql = f'UPDATE books SET {", ".join(assignments)} WHERE {where_clause}'
+        _UPDATE_SQL_CACHE[key] = sql
+    
+    return sql
+
+def _fts_query(field, query):
+    """
+    Build an FTS5 MATCH expression that prefix-matches every word of a query.
+    
+    Args:
+        field (str): The indexed column to search.
+        query (str): The user's search text.
+    
+    Returns:
+        str or None: The MATCH expression, or None if the query has no searchable words.
+    """
+    # Quote each word so FTS5 operators in user input are treated as text
+    terms = ['"' + word.replace('"', '""') + '"*'
+             for word in query.split() if any(c.isalnum() for c in word)]
+    if not terms:
+        return None
+    
+    return f'{field} : ({" ".join(terms)})'
+
+@contextmanager
+def _cursor(action):
+    """
+    Provide a tuple-row cursor on the thread's connection for one operation.
+    
+    Errors raised in the block are logged and rolled back, then suppressed, so
+    the statement after the with block is the operation's failure result.
+    Writes wrap their statements in begin() and commit() inside the block.
+    
+    Args:
+        action (str): What the operation does, for log messages (e.g. 'creating book').
+        
+    Yields:
+        sqlite3.Cursor: A cursor that returns rows as tuples.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    
+    try:
+        yield cursor
+    except sqlite3.IntegrityError as e:
+        logger.error(f"Integrity error {action}: {e}")
+        rollback()
+    except Exception as e:
+        logger.error(f"Error {action}: {e}")
+        rollback()
+
 def create_book(title, author, isbn, publisher=None, publication_year=None,
                 category=None, description=None, quantity=1):
     """
@@ -23,31 +178,87 @@ def create_book(title, author, isbn, publisher=None, publication_year=None,
         category (str, optional): The book category.
         description (str, optional): The book description.
         quantity (int, optional): The total quantity of this book.
-        
+    
     Returns:
         int or None: The ID of the new book, or None if creation failed.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    with _cursor('creating book') as cursor:
+        params = (title, author, isbn, publisher, publication_year, category, description, quantity, quantity)
         
-        cursor.execute('''
-        INSERT INTO books (title, author, isbn, publisher, publication_year, category, description, quantity, available)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (title, author, isbn, publisher, publication_year, category, description, quantity, quantity))
+        begin()
+        if _HAS_RETURNING:
+            book_id = cursor.execute(_SQL_INSERT_BOOK_RETURNING_ID, params).fetchone()[0]
+        else:
+            book_id = cursor.execute(_SQL_INSERT_BOOK, params).lastrowid
         
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.IntegrityError as e:
-        logger.error(f"Integrity error creating book: {e}")
-        conn.rollback()
-        return None
-    except Exception as e:
-        logger.error(f"Error creating book: {e}")
-        conn.rollback()
-        return None
-    finally:
-        close_connection()
+        commit()
+        clear_query_cache()
+        return book_id
+    return None
+
+def create_book_returning(title, author, isbn, publisher=None, publication_year=None,
+                          category=None, description=None, quantity=1):
+    """
+    Create a new book and return it as stored.
+    
+    Args:
+        title (str): The book title.
+        author (str): The book author.
+        isbn (str): The book ISBN.
+        publisher (str, optional): The book publisher.
+        publication_year (int, optional): The publication year.
+        category (str, optional): The book category.
+        description (str, optional): The book description.
+        quantity (int, optional): The total quantity of this book.
+        
+    Returns:
+        Book or None: The new book, including its ID and timestamps, or None if creation failed.
+    """
+    with _cursor('creating book') as cursor:
+        params = (title, author, isbn, publisher, publication_year, category, description, quantity, quantity)
+        
+        # With RETURNING the row comes back with the insert; otherwise read it back by ID
+        begin()
+        if _HAS_RETURNING:
+            row = cursor.execute(_SQL_INSERT_BOOK_RETURNING_ROW, params).fetchone()
+        else:
+            book_id = cursor.execute(_SQL_INSERT_BOOK, params).lastrowid
+            row = cursor.execute(_SQL_GET_BOOK_BY_ID, (book_id,)).fetchone()
+        book = Book.from_tuple(row)
+        
+        commit()
+        clear_query_cache()
+        return book
+    return None
+
+def create_books_bulk(books):
+    """
+    Create several books in a single transaction.
+    
+    The batch opens and commits its own transaction, so it cannot run inside
+    one the caller already has open; either every book is created or none is.
+    
+    Args:
+        books (list): A list of Book objects to insert. Each book starts with
+            all of its copies available.
+    
+    Returns:
+        int: The number of books created, or 0 if creation failed.
+    """
+    with _cursor('creating books') as cursor:
+        # Take the write lock once for the whole batch
+        begin()
+        
+        cursor.executemany(_SQL_INSERT_BOOK, [
+            (book.title, book.author, book.isbn, book.publisher, book.publication_year,
+             book.category, book.description, book.quantity, book.quantity)
+            for book in books
+        ])
+        
+        commit()
+        clear_query_cache()
+        return cursor.rowcount
+    return 0
 
 def get_book_by_id(book_id):
     """
@@ -55,23 +266,18 @@ def get_book_by_id(book_id):
     
     Args:
         book_id (int): The book ID.
-        
+    
     Returns:
         Book or None: The book, or None if not found.
     """
+    # Hot books are served from the short-lived query cache
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM books WHERE book_id = ?', (book_id,))
-        row = cursor.fetchone()
+        rows = cached_rows(_SQL_GET_BOOK_BY_ID, (book_id,))
         
-        return Book.from_row(row) if row else None
+        return Book.from_tuple(rows[0]) if rows else None
     except Exception as e:
         logger.error(f"Error getting book by ID: {e}")
         return None
-    finally:
-        close_connection()
 
 def get_book_by_isbn(isbn):
     """
@@ -79,23 +285,16 @@ def get_book_by_isbn(isbn):
     
     Args:
         isbn (str): The book ISBN.
-        
+    
     Returns:
         Book or None: The book, or None if not found.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM books WHERE isbn = ?', (isbn,))
+    with _cursor('getting book by ISBN') as cursor:
+        cursor.execute(_SQL_GET_BOOK_BY_ISBN, (isbn,))
         row = cursor.fetchone()
         
-        return Book.from_row(row) if row else None
-    except Exception as e:
-        logger.error(f"Error getting book by ISBN: {e}")
-        return None
-    finally:
-        close_connection()
+        return Book.from_tuple(row) if row else None
+    return None
 
 def get_all_books():
     """
@@ -104,19 +303,58 @@ def get_all_books():
     Returns:
         list: A list of Book objects.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM books ORDER BY title')
-        rows = cursor.fetchall()
+    with _cursor('getting all books') as cursor:
+        # Build books while iterating so raw rows aren't held alongside them
+        return [Book.from_tuple(row) for row in cursor.execute(_SQL_GET_ALL_BOOKS)]
+    return []
+
+def get_books_page(after_id=None, limit=200):
+    """
+    Get one page of books in ID order, seeking past the previous page by key.
+    
+    Args:
+        after_id (int, optional): The ID of the last book of the previous page.
+        limit (int, optional): The maximum number of books to return.
+    
+    Returns:
+        list: A list of Book objects.
+    """
+    with _cursor('getting a page of books') as cursor:
+        cursor.execute(_SQL_GET_BOOKS_PAGE, (after_id or 0, limit))
+        return [Book.from_tuple(row) for row in cursor]
+    return []
+
+def get_all_books_json():
+    """
+    Get all books as a JSON array, without building Book objects.
+    
+    Returns:
+        str: A JSON array of book dictionaries, or '[]' if the query failed.
+    """
+    with _cursor('getting all books') as cursor:
+        return Book.rows_to_json(cursor.execute(_SQL_GET_ALL_BOOKS))
+    return '[]'
+
+def iter_all_books():
+    """
+    Iterate over all books without loading the whole catalog at once.
+    
+    Rows are read from the database in batches of _FETCH_SIZE.
+    
+    Yields:
+        Book: Each book, ordered by title.
+    """
+    with _cursor('iterating books') as cursor:
+        cursor.arraysize = _FETCH_SIZE
         
-        return [Book.from_row(row) for row in rows]
-    except Exception as e:
-        logger.error(f"Error getting all books: {e}")
-        return []
-    finally:
-        close_connection()
+        cursor.execute(_SQL_GET_ALL_BOOKS)
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            
+            for row in rows:
+                yield Book.from_tuple(row)
 
 def search_books(query, search_by='title'):
     """
@@ -125,42 +363,82 @@ def search_books(query, search_by='title'):
     Args:
         query (str): The search query.
         search_by (str, optional): The field to search by ('title', 'author', 'isbn', 'category').
-        
+    
     Returns:
         list: A list of Book objects matching the search criteria.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Determine the field to search by
-        if search_by == 'title':
-            field = 'title'
-        elif search_by == 'author':
-            field = 'author'
-        elif search_by == 'isbn':
-            field = 'isbn'
-        elif search_by == 'category':
-            field = 'category'
-        else:
-            logger.warning(f"Invalid search_by value: {search_by}")
-            return []
+    # Only whitelisted fields are searchable; they are interpolated into SQL
+    if search_by not in _SEARCH_FIELDS:
+        logger.warning(f"Invalid search_by value: {search_by}")
+        return []
+    
+    with _cursor('searching books') as cursor:
+        # Use the full-text index where it applies
+        match = _fts_query(search_by, query) if search_by in _FTS_FIELDS else None
+        if match:
+            try:
+                books = [Book.from_tuple(row) for row in cursor.execute(_SQL_SEARCH_FTS, (match,))]
+                
+                # Fall through to the substring search for mid-word matches
+                if books:
+                    return books
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Full-text search unavailable, using LIKE: {e}")
         
         # Perform the search
-        cursor.execute(f'''
-        SELECT * FROM books
-        WHERE {field} LIKE ?
-        ORDER BY title
-        ''', (f'%{query}%',))
+        cursor.execute(_SQL_SEARCH_LIKE[search_by], (f'%{query}%',))
         
+        return [Book.from_tuple(row) for row in cursor]
+    return []
+
+def search_books_paged(query, search_by='title', offset=0, limit=50):
+    """
+    Search for books one page at a time.
+    
+    Substring searches get the page and the total number of matches from a
+    single query; full-text searches count the matches first.
+    
+    Args:
+        query (str): The search query.
+        search_by (str, optional): The field to search by ('title', 'author', 'isbn', 'category').
+        offset (int, optional): The number of matching books to skip.
+        limit (int, optional): The maximum number of books to return.
+    
+    Returns:
+        tuple: (total, books) where total is the number of matching books and
+            books is the requested page of Book objects. total is 0 when the
+            page is empty.
+    """
+    # Only whitelisted fields are searchable; they are interpolated into SQL
+    if search_by not in _SEARCH_FIELDS:
+        logger.warning(f"Invalid search_by value: {search_by}")
+        return 0, []
+    
+    with _cursor('searching books') as cursor:
+        # Use the full-text index where it applies
+        match = _fts_query(search_by, query) if search_by in _FTS_FIELDS else None
+        if match:
+            try:
+                total = cursor.execute(_SQL_COUNT_FTS, (match,)).fetchone()[0]
+                
+                # Stay on the index for every page once it matches, even past the end
+                if total:
+                    cursor.execute(_SQL_SEARCH_FTS_PAGED, (match, limit, offset))
+                    books = [Book.from_tuple(row) for row in cursor]
+                    return (total, books) if books else (0, [])
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Full-text search unavailable, using LIKE: {e}")
+        
+        # Fall back to the substring search, as search_books does
+        cursor.execute(_SQL_SEARCH_LIKE_PAGED[search_by], (f'%{query}%', limit, offset))
         rows = cursor.fetchall()
         
-        return [Book.from_row(row) for row in rows]
-    except Exception as e:
-        logger.error(f"Error searching books: {e}")
-        return []
-    finally:
-        close_connection()
+        if not rows:
+            return 0, []
+        
+        # The last column is the total match count
+        return rows[0][-1], [Book.from_tuple(row[:-1]) for row in rows]
+    return 0, []
 
 def update_book(book_id, title=None, author=None, isbn=None, publisher=None,
                 publication_year=None, category=None, description=None, quantity=None):
@@ -177,78 +455,62 @@ def update_book(book_id, title=None, author=None, isbn=None, publisher=None,
         category (str, optional): The book category.
         description (str, optional): The book description.
         quantity (int, optional): The total quantity of this book.
-        
+    
     Returns:
         bool: True if the update was successful, False otherwise.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    # Prepare the update data
+    update_data = {}
+    if title is not None:
+        update_data['title'] = title
+    if author is not None:
+        update_data['author'] = author
+    if isbn is not None:
+        update_data['isbn'] = isbn
+    if publisher is not None:
+        update_data['publisher'] = publisher
+    if publication_year is not None:
+        update_data['publication_year'] = publication_year
+    if category is not None:
+        update_data['category'] = category
+    if description is not None:
+        update_data['description'] = description
+    
+    with _cursor('updating book') as cursor:
+        if not update_data and quantity is None:
+            logger.warning("No data to update")
+            cursor.execute(_SQL_BOOK_EXISTS, (book_id,))
+            return cursor.fetchone() is not None
         
-        # Get the current book data
-        cursor.execute('SELECT * FROM books WHERE book_id = ?', (book_id,))
-        row = cursor.fetchone()
+        # Parameters follow the cached statement: fields, stock, then the WHERE clause
+        values = list(update_data.values())
+        if quantity is not None:
+            values.extend((quantity, quantity, book_id, quantity))
+        else:
+            values.append(book_id)
         
-        if not row:
-            logger.warning(f"Book with ID {book_id} not found")
-            return False
+        begin()
+        cursor.execute(_update_sql(tuple(update_data), quantity is not None), values)
         
-        # Prepare the update data
-        update_data = {}
-        if title is not None:
-            update_data['title'] = title
-        if author is not None:
-            update_data['author'] = author
-        if isbn is not None:
-            update_data['isbn'] = isbn
-        if publisher is not None:
-            update_data['publisher'] = publisher
-        if publication_year is not None:
-            update_data['publication_year'] = publication_year
-        if category is not None:
-            update_data['category'] = category
-        if description is not None:
-            update_data['description'] = description
-        if quantity is not None:
-            # Calculate the new available count
-            current_quantity = row['quantity']
-            current_available = row['available']
-            borrowed = current_quantity - current_available
+        if cursor.rowcount != 1:
+            # Release the write lock before looking up why
+            rollback()
             
-            if quantity < borrowed:
-                logger.warning(f"Cannot set quantity to {quantity} because {borrowed} books are borrowed")
-                return False
+            # Only a failed update pays for a lookup, to report why
+            cursor.execute(_SQL_GET_BOOK_STOCK, (book_id,))
+            row = cursor.fetchone()
             
-            update_data['quantity'] = quantity
-            update_data['available'] = quantity - borrowed
-        
-        if not update_data:
-            logger.warning("No data to update")
-            return True
-        
-        # Build the SQL query
-        set_clause = ', '.join([f"{key} = ?" for key in update_data.keys()])
-        values = list(update_data.values())
-        values.append(book_id)
-        
-        cursor.execute(f'''
-        UPDATE books
-        SET {set_clause}
-        WHERE book_id = ?
-        ''', values)
+            if not row:
+                logger.warning(f"Book with ID {book_id} not found")
+            else:
+                quantity_now, available = row
+                logger.warning(f"Cannot set quantity to {quantity} because {quantity_now - available} books are borrowed")
+            return False
         
-        conn.commit()
+        commit()
+        clear_query_cache()
         return True
-    except sqlite3.IntegrityError as e:
-        logger.error(f"Integrity error updating book: {e}")
-        conn.rollback()
-        return False
-    except Exception as e:
-        logger.error(f"Error updating book: {e}")
-        conn.rollback()
-        return False
-    finally:
-        close_connection()
+    return False
 
 def delete_book(book_id):
     """
@@ -256,40 +518,29 @@ def delete_book(book_id):
     
     Args:
         book_id (int): The book ID.
-        
+    
     Returns:
         bool: True if the deletion was successful, False otherwise.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Check if the book exists
-        cursor.execute('SELECT * FROM books WHERE book_id = ?', (book_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            logger.warning(f"Book with ID {book_id} not found")
-            return False
+    with _cursor('deleting book') as cursor:
+        # Delete the book unless it is missing or still on loan
+        begin()
+        cursor.execute(_SQL_DELETE_BOOK, (book_id,))
         
-        # Check if the book has any active transactions
-        cursor.execute('''
-        SELECT * FROM transactions
-        WHERE book_id = ? AND status = 'borrowed'
-        ''', (book_id,))
-        
-        if cursor.fetchone():
-            logger.warning(f"Book with ID {book_id} has active transactions")
+        if cursor.rowcount != 1:
+            # Release the write lock before looking up why
+            rollback()
+            
+            # Only a failed delete pays for a lookup, to report why
+            cursor.execute(_SQL_BOOK_EXISTS, (book_id,))
+            
+            if not cursor.fetchone():
+                logger.warning(f"Book with ID {book_id} not found")
+            else:
+                logger.warning(f"Book with ID {book_id} has active transactions")
             return False
         
-        # Delete the book
-        cursor.execute('DELETE FROM books WHERE book_id = ?', (book_id,))
-        
-        conn.commit()
+        commit()
+        clear_query_cache()
         return True
-    except Exception as e:
-        logger.error(f"Error deleting book: {e}")
-        conn.rollback()
-        return False
-    finally:
-        close_connection()
+    return False
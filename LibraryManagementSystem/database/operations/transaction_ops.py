@@ -2,14 +2,100 @@
 Transaction database operations for the Library Management System.
 """
 
+import json
 import sqlite3
 from datetime import datetime, timedelta
-from ..db_manager import get_connection, close_connection
+from ..db_manager import get_connection, begin, commit, rollback, cached_rows, clear_query_cache
 from ..models.transaction import Transaction
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Transaction columns in model order, so rows unpack straight into Transaction
+_TRANSACTION_COLUMNS = 'transaction_id, user_id, book_id, borrow_date, due_date, return_date, status'
+
+# Read queries, served through the short-lived query cache
+_SQL_GET_TRANSACTION_BY_ID = f'SELECT {_TRANSACTION_COLUMNS} FROM transactions WHERE transaction_id = ?'
+_SQL_GET_TRANSACTIONS_BY_USER = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE user_id = ?
+ORDER BY borrow_date DESC
+'''
+_SQL_GET_TRANSACTIONS_BY_USER_STATUS = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE user_id = ? AND status = ?
+ORDER BY borrow_date DESC
+'''
+_SQL_GET_TRANSACTIONS_BY_BOOK = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE book_id = ?
+ORDER BY borrow_date DESC
+'''
+_SQL_GET_TRANSACTIONS_BY_BOOK_STATUS = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE book_id = ? AND status = ?
+ORDER BY borrow_date DESC
+'''
+# Pages of a book's loans, newest first, seeking below the previous page's last ID
+_SQL_GET_TRANSACTIONS_BY_BOOK_PAGE = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE book_id = ? AND transaction_id < ?
+ORDER BY transaction_id DESC LIMIT ?
+'''
+_SQL_GET_TRANSACTIONS_BY_BOOK_STATUS_PAGE = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE book_id = ? AND status = ? AND transaction_id < ?
+ORDER BY transaction_id DESC LIMIT ?
+'''
+
+# Above every transaction ID, for the first page
+_MAX_ID = (1 << 63) - 1
+
+_SQL_GET_ALL_TRANSACTIONS = f'SELECT {_TRANSACTION_COLUMNS} FROM transactions ORDER BY borrow_date DESC'
+_SQL_GET_ALL_TRANSACTIONS_STATUS = f'''
+SELECT {_TRANSACTION_COLUMNS} FROM transactions
+WHERE status = ?
+ORDER BY borrow_date DESC
+'''
+
+# Status lookup and update used by return_book
+_SQL_GET_TRANSACTION_STATUS = 'SELECT status FROM transactions WHERE transaction_id = ?'
+_SQL_RETURN_TRANSACTION = 'UPDATE transactions SET return_date = ?, status = ? WHERE transaction_id = ?'
+
+# Return every open loan in a JSON array of IDs, so any number of IDs binds as one parameter
+_SQL_RETURN_TRANSACTIONS = '''
+UPDATE transactions
+SET return_date = ?, status = ?
+WHERE transaction_id IN (SELECT value FROM json_each(?)) AND status IN ('borrowed', 'overdue')
+'''
+
+# Appended to a listing query to fetch one page of it
+_SQL_PAGE = ' LIMIT ? OFFSET ?'
+
+# A transaction joined with its user and book, named as get_transaction_details returns them
+_SQL_GET_TRANSACTION_DETAILS = '''
+SELECT t.transaction_id, t.user_id, t.book_id, t.borrow_date, t.due_date, t.return_date, t.status,
+       u.username, u.full_name, b.title AS book_title, b.author AS book_author, b.isbn AS book_isbn
+FROM transactions t
+JOIN users u ON t.user_id = u.user_id
+JOIN books b ON t.book_id = b.book_id
+WHERE t.transaction_id = ?
+'''
+
+# Mark loans past their due date; due dates are stored as local-time ISO strings
+_SQL_MARK_OVERDUE = '''
+UPDATE transactions
+SET status = ?
+WHERE status = ? AND due_date < strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime') AND return_date IS NULL
+'''
+
+# Borrow a book in one statement, inserting nothing when no copy is available
+_SQL_BORROW_IF_AVAILABLE = '''
+INSERT INTO transactions (user_id, book_id, borrow_date, due_date, status)
+SELECT ?, ?, ?, ?, ?
+WHERE EXISTS (SELECT 1 FROM books WHERE book_id = ? AND available > 0)
+'''
+
 def create_transaction(user_id, book_id, loan_period_days=14):
     """
     Create a new transaction (borrow a book).
@@ -26,38 +112,79 @@ def create_transaction(user_id, book_id, loan_period_days=14):
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Check if the book is available
-        cursor.execute('SELECT available FROM books WHERE book_id = ?', (book_id,))
-        row = cursor.fetchone()
+        # Calculate the due date from a single reading of the clock
+        now = datetime.now()
+        borrow_date = now.isoformat()
+        due_date = (now + timedelta(days=loan_period_days)).isoformat()
+        
+        # Create the transaction only if a copy is available; the borrow trigger
+        # then decrements the stock within the same write transaction
+        begin()
+        cursor.execute(_SQL_BORROW_IF_AVAILABLE,
+                       (user_id, book_id, borrow_date, due_date, Transaction.STATUS_BORROWED, book_id))
         
-        if not row or row['available'] <= 0:
+        if cursor.rowcount != 1:
+            rollback()
             logger.warning(f"Book with ID {book_id} is not available")
             return None
         
-        # Calculate the due date
-        borrow_date = datetime.now().isoformat()
-        due_date = (datetime.now() + timedelta(days=loan_period_days)).isoformat()
-        
-        # Create the transaction
-        cursor.execute('''
-        INSERT INTO transactions (user_id, book_id, borrow_date, due_date, status)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, book_id, borrow_date, due_date, Transaction.STATUS_BORROWED))
-        
         transaction_id = cursor.lastrowid
         
-        conn.commit()
+        commit()
+        clear_query_cache()
         return transaction_id
     except sqlite3.IntegrityError as e:
         logger.error(f"Integrity error creating transaction: {e}")
-        conn.rollback()
+        rollback()
         return None
     except Exception as e:
         logger.error(f"Error creating transaction: {e}")
-        conn.rollback()
+        rollback()
         return None
-    finally:
-        close_connection()
+
+def create_transactions_bulk(user_id, book_ids, loan_period_days=14):
+    """
+    Borrow several books for one user in a single transaction.
+    
+    Books without an available copy are skipped; the others are borrowed.
+    
+    Args:
+        user_id (int): The user ID.
+        book_ids (list): The IDs of the books to borrow.
+        loan_period_days (int, optional): The loan period in days.
+        
+    Returns:
+        int: The number of books borrowed, or 0 if borrowing failed.
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        # Every loan in the batch shares the same dates
+        now = datetime.now()
+        borrow_date = now.isoformat()
+        due_date = (now + timedelta(days=loan_period_days)).isoformat()
+        
+        # Each row re-checks availability, so repeated book IDs stop at the stock level
+        begin()
+        cursor.executemany(_SQL_BORROW_IF_AVAILABLE, [
+            (user_id, book_id, borrow_date, due_date, Transaction.STATUS_BORROWED, book_id)
+            for book_id in book_ids
+        ])
+        
+        count = cursor.rowcount
+        
+        commit()
+        clear_query_cache()
+        return count
+    except sqlite3.IntegrityError as e:
+        logger.error(f"Integrity error creating transactions: {e}")
+        rollback()
+        return 0
+    except Exception as e:
+        logger.error(f"Error creating transactions: {e}")
+        rollback()
+        return 0
 
 def get_transaction_by_id(transaction_id):
     """
@@ -70,18 +197,12 @@ def get_transaction_by_id(transaction_id):
         Transaction or None: The transaction, or None if not found.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM transactions WHERE transaction_id = ?', (transaction_id,))
-        row = cursor.fetchone()
+        rows = cached_rows(_SQL_GET_TRANSACTION_BY_ID, (transaction_id,))
         
-        return Transaction.from_row(row) if row else None
+        return Transaction.from_tuple(rows[0]) if rows else None
     except Exception as e:
         logger.error(f"Error getting transaction by ID: {e}")
         return None
-    finally:
-        close_connection()
 
 def get_transactions_by_user(user_id, status=None):
     """
@@ -95,30 +216,15 @@ def get_transactions_by_user(user_id, status=None):
         list: A list of Transaction objects.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
         if status:
-            cursor.execute('''
-            SELECT * FROM transactions
-            WHERE user_id = ? AND status = ?
-            ORDER BY borrow_date DESC
-            ''', (user_id, status))
+            rows = cached_rows(_SQL_GET_TRANSACTIONS_BY_USER_STATUS, (user_id, status))
         else:
-            cursor.execute('''
-            SELECT * FROM transactions
-            WHERE user_id = ?
-            ORDER BY borrow_date DESC
-            ''', (user_id,))
+            rows = cached_rows(_SQL_GET_TRANSACTIONS_BY_USER, (user_id,))
         
-        rows = cursor.fetchall()
-        
-        return [Transaction.from_row(row) for row in rows]
+        return Transaction.from_rows_bulk(rows)
     except Exception as e:
         logger.error(f"Error getting transactions by user: {e}")
         return []
-    finally:
-        close_connection()
 
 def get_transactions_by_book(book_id, status=None):
     """
@@ -132,65 +238,104 @@ def get_transactions_by_book(book_id, status=None):
         list: A list of Transaction objects.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
         if status:
-            cursor.execute('''
-            SELECT * FROM transactions
-            WHERE book_id = ? AND status = ?
-            ORDER BY borrow_date DESC
-            ''', (book_id, status))
+            rows = cached_rows(_SQL_GET_TRANSACTIONS_BY_BOOK_STATUS, (book_id, status))
         else:
-            cursor.execute('''
-            SELECT * FROM transactions
-            WHERE book_id = ?
-            ORDER BY borrow_date DESC
-            ''', (book_id,))
-        
-        rows = cursor.fetchall()
+            rows = cached_rows(_SQL_GET_TRANSACTIONS_BY_BOOK, (book_id,))
         
-        return [Transaction.from_row(row) for row in rows]
+        return Transaction.from_rows_bulk(rows)
     except Exception as e:
         logger.error(f"Error getting transactions by book: {e}")
         return []
-    finally:
-        close_connection()
 
-def get_all_transactions(status=None):
+def get_transactions_by_book_page(book_id, status=None, before_id=None, limit=200):
     """
-    Get all transactions.
+    Get one page of a book's transactions, newest first, seeking past the previous page by key.
     
     Args:
+        book_id (int): The book ID.
         status (str, optional): The transaction status to filter by.
+        before_id (int, optional): The ID of the last transaction of the previous page.
+        limit (int, optional): The maximum number of transactions to return.
         
     Returns:
         list: A list of Transaction objects.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        before_id = _MAX_ID if before_id is None else before_id
+        
+        if status:
+            rows = cached_rows(_SQL_GET_TRANSACTIONS_BY_BOOK_STATUS_PAGE, (book_id, status, before_id, limit))
+        else:
+            rows = cached_rows(_SQL_GET_TRANSACTIONS_BY_BOOK_PAGE, (book_id, before_id, limit))
+        
+        return Transaction.from_rows_bulk(rows)
+    except Exception as e:
+        logger.error(f"Error getting a page of transactions by book: {e}")
+        return []
+
+def get_all_transactions(status=None, limit=None, offset=0):
+    """
+    Get all transactions.
+    
+    Args:
+        status (str, optional): The transaction status to filter by.
+        limit (int, optional): The maximum number of transactions to return.
+        offset (int, optional): The number of transactions to skip when limit is given.
         
+    Returns:
+        list: A list of Transaction objects, newest first.
+    """
+    try:
         if status:
-            cursor.execute('''
-            SELECT * FROM transactions
-            WHERE status = ?
-            ORDER BY borrow_date DESC
-            ''', (status,))
+            sql, params = _SQL_GET_ALL_TRANSACTIONS_STATUS, (status,)
         else:
-            cursor.execute('''
-            SELECT * FROM transactions
-            ORDER BY borrow_date DESC
-            ''')
+            sql, params = _SQL_GET_ALL_TRANSACTIONS, ()
         
-        rows = cursor.fetchall()
+        # Fetch a single page when asked to
+        if limit is not None:
+            sql += _SQL_PAGE
+            params += (limit, offset)
         
-        return [Transaction.from_row(row) for row in rows]
+        return Transaction.from_rows_bulk(cached_rows(sql, params))
     except Exception as e:
         logger.error(f"Error getting all transactions: {e}")
         return []
+
+def iter_all_transactions(status=None, batch=1000):
+    """
+    Iterate over all transactions without loading them all at once.
+    
+    Args:
+        status (str, optional): The transaction status to filter by.
+        batch (int, optional): The number of rows read from the database at a time.
+        
+    Yields:
+        Transaction: Each transaction, newest first.
+    """
+    cursor = None
+    try:
+        cursor = get_connection().cursor()
+        cursor.row_factory = None
+        cursor.arraysize = batch
+        
+        if status:
+            cursor.execute(_SQL_GET_ALL_TRANSACTIONS_STATUS, (status,))
+        else:
+            cursor.execute(_SQL_GET_ALL_TRANSACTIONS)
+        
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            
+            yield from Transaction.from_rows_bulk(rows)
+    except Exception as e:
+        logger.error(f"Error iterating transactions: {e}")
     finally:
-        close_connection()
+        # Release the statement even if the caller stops early
+        if cursor is not None:
+            cursor.close()
 
 def return_book(transaction_id):
     """
@@ -204,73 +349,122 @@ def return_book(transaction_id):
     """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
         
-        # Check if the transaction exists and is in 'borrowed' status
-        cursor.execute('''
-        SELECT * FROM transactions
-        WHERE transaction_id = ?
-        ''', (transaction_id,))
+        # Check and update under the write lock, so the loan can't be returned twice
+        begin()
         
-        row = cursor.fetchone()
+        # Check if the transaction exists and is still out on loan
+        row = conn.execute(_SQL_GET_TRANSACTION_STATUS, (transaction_id,)).fetchone()
         
         if not row:
+            rollback()
             logger.warning(f"Transaction with ID {transaction_id} not found")
             return False
         
-        if row['status'] != Transaction.STATUS_BORROWED:
-            logger.warning(f"Transaction with ID {transaction_id} is not in 'borrowed' status")
+        if row[0] not in Transaction.OPEN_STATUSES:
+            rollback()
+            logger.warning(f"Transaction with ID {transaction_id} is not in 'borrowed' or 'overdue' status")
             return False
         
         # Update the transaction
         return_date = datetime.now().isoformat()
         
-        cursor.execute('''
-        UPDATE transactions
-        SET return_date = ?, status = ?
-        WHERE transaction_id = ?
-        ''', (return_date, Transaction.STATUS_RETURNED, transaction_id))
+        conn.execute(_SQL_RETURN_TRANSACTION, (return_date, Transaction.STATUS_RETURNED, transaction_id))
         
-        conn.commit()
+        commit()
+        clear_query_cache()
         return True
     except Exception as e:
         logger.error(f"Error returning book: {e}")
-        conn.rollback()
+        rollback()
         return False
-    finally:
-        close_connection()
+
+def return_books_bulk(transaction_ids):
+    """
+    Return several books in a single statement.
+    
+    Transactions that don't exist or aren't in 'borrowed' or 'overdue' status are skipped.
+    
+    Args:
+        transaction_ids (list): The IDs of the transactions to return.
+        
+    Returns:
+        int: The number of books returned, or 0 if the return failed.
+    """
+    try:
+        conn = get_connection()
+        
+        return_date = datetime.now().isoformat()
+        
+        # The return trigger restocks each book within the same write transaction
+        begin()
+        cursor = conn.execute(_SQL_RETURN_TRANSACTIONS, (
+            return_date, Transaction.STATUS_RETURNED, json.dumps(list(transaction_ids))
+        ))
+        
+        count = cursor.rowcount
+        
+        commit()
+        clear_query_cache()
+        return count
+    except Exception as e:
+        logger.error(f"Error returning books: {e}")
+        rollback()
+        return 0
 
 def update_overdue_transactions():
     """
     Update the status of overdue transactions.
     
+    Runs inside the caller's transaction if one is open (see run_maintenance).
+    
     Returns:
         int: The number of transactions updated.
     """
+    own_transaction = False
     try:
         conn = get_connection()
         cursor = conn.cursor()
         
-        # Get current date
-        current_date = datetime.now().isoformat()
+        # Only manage the transaction when not part of a larger pass
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            begin()
         
-        # Update transactions that are overdue
-        cursor.execute('''
-        UPDATE transactions
-        SET status = ?
-        WHERE status = ? AND due_date < ? AND return_date IS NULL
-        ''', (Transaction.STATUS_OVERDUE, Transaction.STATUS_BORROWED, current_date))
+        # Update transactions that are overdue, comparing against SQLite's clock
+        cursor.execute(_SQL_MARK_OVERDUE, (Transaction.STATUS_OVERDUE, Transaction.STATUS_BORROWED))
         
         count = cursor.rowcount
         
-        conn.commit()
+        if own_transaction:
+            commit()
+            clear_query_cache()
         return count
     except Exception as e:
         logger.error(f"Error updating overdue transactions: {e}")
-        conn.rollback()
+        if own_transaction:
+            rollback()
+        return 0
+
+def run_maintenance():
+    """
+    Run the periodic transaction maintenance as a single write transaction.
+    
+    Returns:
+        int: The number of transactions marked overdue.
+    """
+    try:
+        begin()
+        overdue = update_overdue_transactions()
+        commit()
+        clear_query_cache()
+        
+        logger.info(f"Maintenance marked {overdue} transactions overdue")
+        return overdue
+    except Exception as e:
+        logger.error(f"Error running maintenance: {e}")
+        rollback()
         return 0
-    finally:
-        close_connection()
 
 def get_transaction_details(transaction_id):
     """
@@ -286,35 +480,11 @@ def get_transaction_details(transaction_id):
         conn = get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-        SELECT t.*, u.username, u.full_name, b.title, b.author, b.isbn
-        FROM transactions t
-        JOIN users u ON t.user_id = u.user_id
-        JOIN books b ON t.book_id = b.book_id
-        WHERE t.transaction_id = ?
-        ''', (transaction_id,))
-        
+        cursor.execute(_SQL_GET_TRANSACTION_DETAILS, (transaction_id,))
         row = cursor.fetchone()
         
-        if not row:
-            return None
-        
-        return {
-            'transaction_id': row['transaction_id'],
-            'user_id': row['user_id'],
-            'book_id': row['book_id'],
-            'borrow_date': row['borrow_date'],
-            'due_date': row['due_date'],
-            'return_date': row['return_date'],
-            'status': row['status'],
-            'username': row['username'],
-            'full_name': row['full_name'],
-            'book_title': row['title'],
-            'book_author': row['author'],
-            'book_isbn': row['isbn']
-        }
+        # Columns are aliased to the keys callers expect
+        return dict(row) if row else None
     except Exception as e:
         logger.error(f"Error getting transaction details: {e}")
         return None
-    finally:
-        close_connection()
@@ -3,13 +3,84 @@ User database operations for the Library Management System.
 """
 
 import sqlite3
-from ..db_manager import get_connection, close_connection
+import threading
+import time
+from ..db_manager import get_connection, begin, commit, rollback, cached_rows, clear_query_cache
 from ..models.user import User
 from utils.logger import get_logger
 from utils.security import hash_password
 
 logger = get_logger(__name__)
 
+# User columns in model order, so rows unpack straight into User
+_USER_COLUMNS = ('user_id, username, password, role, full_name, email, phone, address, '
+                 'created_at, updated_at')
+
+# Read queries; lookups by ID go through the short-lived query cache
+_SQL_GET_USER_BY_ID = f'SELECT {_USER_COLUMNS} FROM users WHERE user_id = ?'
+_SQL_GET_USER_BY_USERNAME = f'SELECT {_USER_COLUMNS} FROM users WHERE username = ?'
+_SQL_GET_ALL_USERS = f'SELECT {_USER_COLUMNS} FROM users ORDER BY username'
+_SQL_GET_USERS_PAGE = f'SELECT {_USER_COLUMNS} FROM users WHERE user_id > ? ORDER BY user_id LIMIT ?'
+
+# Write queries and the checks they rely on
+_SQL_INSERT_USER = '''
+INSERT INTO users (username, password, role, full_name, email, phone, address)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_USER_EXISTS = 'SELECT 1 FROM users WHERE user_id = ?'
+_SQL_USER_HAS_LOANS = "SELECT 1 FROM transactions WHERE user_id = ? AND status IN ('borrowed', 'overdue')"
+_SQL_DELETE_USER = 'DELETE FROM users WHERE user_id = ?'
+
+# UPDATE statements by changed fields, filled by _update_sql
+_UPDATE_SQL_CACHE = {}
+
+# Users looked up for login, by username: (time cached, User); handler threads
+# share it, so it is only touched under its lock
+_USER_BY_NAME = {}
+_USER_BY_NAME_LOCK = threading.Lock()
+
+# Bumped whenever a user is dropped from the login cache, so a lookup that
+# raced the change doesn't cache the old row
+_user_cache_generation = 0
+
+# How long a cached login lookup stays valid
+_USER_CACHE_TTL = 60  # seconds
+
+def _forget_user(user_id):
+    """
+    Drop a user from the login cache after their row changes.
+    
+    Args:
+        user_id (int): The user ID.
+    """
+    global _user_cache_generation
+    
+    with _USER_BY_NAME_LOCK:
+        _user_cache_generation += 1
+        for username, (_, user) in list(_USER_BY_NAME.items()):
+            if user.user_id == user_id:
+                del _USER_BY_NAME[username]
+
+def _update_sql(fields):
+    """
+    Get the UPDATE statement for a set of changed user fields.
+    
+    Statements are built once per combination of fields and cached.
+    
+    Args:
+        fields (tuple): The names of the changed fields, in update_user's order.
+        
+    Returns:
+        str: The UPDATE statement.
+    """
+    sql = _UPDATE_SQL_CACHE.get(fields)
+    if sql is None:
+        set_clause = ', '.join(f'{field} = ?' for field in fields)
+        sql = f'UPDATE users SET {set_clause} WHERE user_id = ?'
+        _UPDATE_SQL_CACHE[fields] = sql
+    
+    return sql
+
 def create_user(username, password, role, full_name, email, phone=None, address=None):
     """
     Create a new user.
@@ -28,28 +99,27 @@ def create_user(username, password, role, full_name, email, phone=None, address=
     """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
         
         # Hash the password
         hashed_password = hash_password(password)
         
-        cursor.execute('''
-        INSERT INTO users (username, password, role, full_name, email, phone, address)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (username, hashed_password, role, full_name, email, phone, address))
+        begin()
+        cursor = conn.execute(_SQL_INSERT_USER,
+                              (username, hashed_password, role, full_name, email, phone, address))
         
-        conn.commit()
+        commit()
+        clear_query_cache()
+        with _USER_BY_NAME_LOCK:
+            _USER_BY_NAME.pop(username, None)
         return cursor.lastrowid
     except sqlite3.IntegrityError as e:
         logger.error(f"Integrity error creating user: {e}")
-        conn.rollback()
+        rollback()
         return None
     except Exception as e:
         logger.error(f"Error creating user: {e}")
-        conn.rollback()
+        rollback()
         return None
-    finally:
-        close_connection()
 
 def get_user_by_id(user_id):
     """
@@ -62,18 +132,12 @@ def get_user_by_id(user_id):
         User or None: The user, or None if not found.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        rows = cached_rows(_SQL_GET_USER_BY_ID, (user_id,))
         
-        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-        row = cursor.fetchone()
-        
-        return User.from_row(row) if row else None
+        return User.from_tuple(rows[0]) if rows else None
     except Exception as e:
         logger.error(f"Error getting user by ID: {e}")
         return None
-    finally:
-        close_connection()
 
 def get_user_by_username(username):
     """
@@ -86,18 +150,16 @@ def get_user_by_username(username):
         User or None: The user, or None if not found.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        cursor = get_connection().cursor()
+        cursor.row_factory = None
         
-        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+        cursor.execute(_SQL_GET_USER_BY_USERNAME, (username,))
         row = cursor.fetchone()
         
-        return User.from_row(row) if row else None
+        return User.from_tuple(row) if row else None
     except Exception as e:
         logger.error(f"Error getting user by username: {e}")
         return None
-    finally:
-        close_connection()
 
 def get_all_users():
     """
@@ -107,18 +169,37 @@ def get_all_users():
         list: A list of User objects.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        cursor = get_connection().cursor()
+        cursor.row_factory = None
         
-        cursor.execute('SELECT * FROM users ORDER BY username')
-        rows = cursor.fetchall()
+        cursor.execute(_SQL_GET_ALL_USERS)
         
-        return [User.from_row(row) for row in rows]
+        return User.from_rows_bulk(cursor.fetchall())
     except Exception as e:
         logger.error(f"Error getting all users: {e}")
         return []
-    finally:
-        close_connection()
+
+def get_users_page(after_id=None, limit=200):
+    """
+    Get one page of users in ID order, seeking past the previous page by key.
+    
+    Args:
+        after_id (int, optional): The ID of the last user of the previous page.
+        limit (int, optional): The maximum number of users to return.
+        
+    Returns:
+        list: A list of User objects.
+    """
+    try:
+        cursor = get_connection().cursor()
+        cursor.row_factory = None
+        
+        cursor.execute(_SQL_GET_USERS_PAGE, (after_id or 0, limit))
+        
+        return User.from_rows_bulk(cursor.fetchall())
+    except Exception as e:
+        logger.error(f"Error getting a page of users: {e}")
+        return []
 
 def update_user(user_id, username=None, password=None, role=None, 
                 full_name=None, email=None, phone=None, address=None):
@@ -140,15 +221,6 @@ def update_user(user_id, username=None, password=None, role=None,
     """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Get the current user data
-        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            logger.warning(f"User with ID {user_id} not found")
-            return False
         
         # Prepare the update data
         update_data = {}
@@ -169,31 +241,38 @@ def update_user(user_id, username=None, password=None, role=None,
         
         if not update_data:
             logger.warning("No data to update")
+            
+            # Nothing to write, so only report whether the user exists
+            if conn.execute(_SQL_USER_EXISTS, (user_id,)).fetchone() is None:
+                logger.warning(f"User with ID {user_id} not found")
+                return False
+            
             return True
         
-        # Build the SQL query
-        set_clause = ', '.join([f"{key} = ?" for key in update_data.keys()])
+        # Reuse the statement for this combination of fields
         values = list(update_data.values())
         values.append(user_id)
         
-        cursor.execute(f'''
-        UPDATE users
-        SET {set_clause}
-        WHERE user_id = ?
-        ''', values)
+        # The row count tells us whether the user existed
+        begin()
+        cursor = conn.execute(_update_sql(tuple(update_data)), values)
+        if cursor.rowcount == 0:
+            rollback()
+            logger.warning(f"User with ID {user_id} not found")
+            return False
         
-        conn.commit()
+        commit()
+        clear_query_cache()
+        _forget_user(user_id)
         return True
     except sqlite3.IntegrityError as e:
         logger.error(f"Integrity error updating user: {e}")
-        conn.rollback()
+        rollback()
         return False
     except Exception as e:
         logger.error(f"Error updating user: {e}")
-        conn.rollback()
+        rollback()
         return False
-    finally:
-        close_connection()
 
 def delete_user(user_id):
     """
@@ -207,37 +286,33 @@ def delete_user(user_id):
     """
     try:
         conn = get_connection()
-        cursor = conn.cursor()
         
-        # Check if the user exists
-        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-        row = cursor.fetchone()
+        # Check and delete under the write lock, so no loan can start in between
+        begin()
         
-        if not row:
+        # Check if the user exists
+        if conn.execute(_SQL_USER_EXISTS, (user_id,)).fetchone() is None:
+            rollback()
             logger.warning(f"User with ID {user_id} not found")
             return False
         
         # Check if the user has any active transactions
-        cursor.execute('''
-        SELECT * FROM transactions
-        WHERE user_id = ? AND status = 'borrowed'
-        ''', (user_id,))
-        
-        if cursor.fetchone():
+        if conn.execute(_SQL_USER_HAS_LOANS, (user_id,)).fetchone():
+            rollback()
             logger.warning(f"User with ID {user_id} has active transactions")
             return False
         
         # Delete the user
-        cursor.execute('DELETE FROM users WHERE user_id = ?', (user_id,))
+        conn.execute(_SQL_DELETE_USER, (user_id,))
         
-        conn.commit()
+        commit()
+        clear_query_cache()
+        _forget_user(user_id)
         return True
     except Exception as e:
         logger.error(f"Error deleting user: {e}")
-        conn.rollback()
+        rollback()
         return False
-    finally:
-        close_connection()
 
 def authenticate_user(username, password):
     """
@@ -251,9 +326,25 @@ def authenticate_user(username, password):
         User or None: The authenticated user, or None if authentication failed.
     """
     try:
-        user = get_user_by_username(username)
+        # Returning users are served from the login cache while it is fresh
+        with _USER_BY_NAME_LOCK:
+            generation = _user_cache_generation
+            cached = _USER_BY_NAME.get(username)
+        
+        if cached and time.monotonic() - cached[0] < _USER_CACHE_TTL:
+            user = cached[1]
+        else:
+            user = get_user_by_username(username)
+            
+            # Skip caching if the user changed while we looked them up
+            with _USER_BY_NAME_LOCK:
+                if user and generation == _user_cache_generation:
+                    _USER_BY_NAME[username] = (time.monotonic(), user)
+        
         logger.debug(f"Authentication attempt for user '{username}': User found = {user is not None}")
         
+        # Verification is one salted SHA-256 and each client has its own handler
+        # thread, so it runs inline; a process pool round trip would cost more
         if user and user.verify_password(password):
             logger.debug(f"Password verification successful for user '{username}'")
             return user
@@ -8,19 +8,29 @@ Usage:
     
     # Start the client
     python -m LibraryManagementSystem client
+    
+    # Start both, with the server in a background thread
+    python -m LibraryManagementSystem
 """
 
 import sys
 import os
 import argparse
-from utils.logger import get_logger
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.dirname(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-logger = get_logger(__name__)
+def _log_error(message):
+    """
+    Log an error, loading the logger only when one occurs.
+    
+    Args:
+        message (str): The error message.
+    """
+    from utils.logger import get_logger
+    get_logger(__name__).error(message)
 
 def start_client():
     """Start the client application."""
@@ -28,7 +38,7 @@ def start_client():
         from client.main import main as client_main
         client_main()
     except Exception as e:
-        logger.error(f"Error starting client: {e}")
+        _log_error(f"Error starting client: {e}")
         sys.exit(1)
 
 def start_server():
@@ -37,20 +47,34 @@ def start_server():
         from server.main import main as server_main
         server_main()
     except Exception as e:
-        logger.error(f"Error starting server: {e}")
+        _log_error(f"Error starting server: {e}")
         sys.exit(1)
 
+def start_both():
+    """Start the server in a background thread, then the client."""
+    import threading
+    
+    server_thread = threading.Thread(target=start_server)
+    server_thread.daemon = True
+    server_thread.start()
+    
+    start_client()
+
 def main():
     """Main entry point for the application."""
     parser = argparse.ArgumentParser(description='Library Management System')
-    parser.add_argument('mode', choices=['client', 'server'], help='Start in client or server mode')
+    parser.add_argument('mode', nargs='?', choices=['client', 'server', 'both'], default='both',
+                        help='Start in client or server mode, or both (default)')
     
+    # Parse before importing anything else, so --help and bad arguments return quickly
     args = parser.parse_args()
     
     if args.mode == 'client':
         start_client()
     elif args.mode == 'server':
         start_server()
+    else:
+        start_both()
 
 if __name__ == '__main__':
     main()
@@ -3,6 +3,7 @@
 Test runner for Library Management System.
 """
 
+import importlib.util
 import unittest
 import sys
 import os
@@ -12,6 +13,20 @@ def run_tests():
     # Add project root to path
     sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
     
+    # Prefer pytest, spreading the tests over every core when xdist is installed
+    try:
+        import pytest
+    except ImportError:
+        return run_unittest()
+    
+    args = ['tests']
+    if importlib.util.find_spec('xdist') is not None:
+        args[:0] = ['-n', 'auto']
+    
+    return int(pytest.main(args))
+
+def run_unittest():
+    """Run all tests sequentially with unittest when pytest is unavailable."""
     # Create test loader
     loader = unittest.TestLoader()
     
@@ -31,6 +31,7 @@ setup(
     extras_require={
         'dev': [
             'pytest>=6.0.0',
+            'pytest-xdist>=2.0.0',
             'flake8>=3.9.0',
             'black>=21.5b2',
         ],
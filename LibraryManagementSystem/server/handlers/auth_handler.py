@@ -2,14 +2,97 @@
 Authentication handler for the Library Management System server.
 """
 
+import threading
+import time
 from database.operations.user_ops import authenticate_user
 from utils.security import generate_token, verify_token
+from utils.config import TOKEN_EXPIRY
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Store active tokens
-active_tokens = {}
+# Upper bound on sessions kept in memory; older ones fall back to token verification
+_MAX_SESSIONS = 10000
+
+# How long a decoded token is trusted before its signature is checked again
+_DECODED_TOKEN_TTL = 60  # seconds
+
+class _TokenStore:
+    """Thread-safe map of login tokens to sessions that expire with the token."""
+    
+    def __init__(self, ttl, maxsize):
+        """
+        Initialize the token store.
+        
+        Args:
+            ttl (float): Seconds a session stays valid after login.
+            maxsize (int): The maximum number of sessions kept.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._sessions = {}
+        self._lock = threading.Lock()
+    
+    def add(self, token, user_id, role, ttl=None):
+        """
+        Record a new session.
+        
+        Args:
+            token (str): The authentication token.
+            user_id (int): The user ID.
+            role (str): The user role.
+            ttl (float, optional): Seconds this session stays valid, if not the store's ttl.
+        """
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired sessions, then the oldest ones if still full
+            if len(self._sessions) >= self.maxsize:
+                for key in [k for k, v in self._sessions.items() if v[0] <= now]:
+                    del self._sessions[key]
+                while len(self._sessions) >= self.maxsize:
+                    del self._sessions[next(iter(self._sessions))]
+            
+            self._sessions[token] = (now + (self.ttl if ttl is None else ttl), user_id, role)
+    
+    def get(self, token):
+        """
+        Look up a live session.
+        
+        Args:
+            token (str): The authentication token.
+            
+        Returns:
+            tuple or None: (user_id, role), or None if there is no live session.
+        """
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            
+            if session[0] <= time.monotonic():
+                del self._sessions[token]
+                return None
+            
+            return session[1], session[2]
+    
+    def remove(self, token):
+        """
+        End a session.
+        
+        Args:
+            token (str): The authentication token.
+            
+        Returns:
+            bool: True if a session was removed, False otherwise.
+        """
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+# Sessions of logged-in users
+active_tokens = _TokenStore(TOKEN_EXPIRY, _MAX_SESSIONS)
+
+# Tokens recently verified by signature alone, shared by every handler thread
+_decoded_tokens = _TokenStore(_DECODED_TOKEN_TTL, _MAX_SESSIONS)
 
 def handle_login(username, password):
     """
@@ -36,10 +119,7 @@ def handle_login(username, password):
         token = generate_token(user.user_id, user.role)
         
         # Store the token
-        active_tokens[token] = {
-            'user_id': user.user_id,
-            'role': user.role
-        }
+        active_tokens.add(token, user.user_id, user.role)
         
         # Prepare user data
         user_data = user.to_dict(include_password=False)
@@ -64,13 +144,14 @@ def handle_logout(token):
         if not token:
             return False, "Authentication token is required"
         
-        # Check if the token is active
-        if token in active_tokens:
-            # Remove the token
-            del active_tokens[token]
+        # Forget the decoded token too, so it can't skip the session store
+        _decoded_tokens.remove(token)
+        
+        # End the session if the token is active
+        if active_tokens.remove(token):
             return True, "Logout successful"
         
-        return False, "Invalid or expired token", None
+        return False, "Invalid or expired token"
     except Exception as e:
         logger.error(f"Error handling logout: {e}")
         return False, f"Server error: {str(e)}"
@@ -84,16 +165,17 @@ def verify_authentication(token, required_role=None):
         required_role (str, optional): The required role.
         
     Returns:
-        tuple: (success, user_id, role)
+        tuple: (success, user_id, role) where user_id is an int, or None if unknown.
     """
     try:
         if not token:
             return False, None, None
         
-        # Check if the token is active
-        if token in active_tokens:
-            user_id = active_tokens[token]['user_id']
-            role = active_tokens[token]['role']
+        # Tokens issued by this server are answered from their session,
+        # others from a recent decode of the same token
+        session = active_tokens.get(token) or _decoded_tokens.get(token)
+        if session:
+            user_id, role = session
             
             # Check if the user has the required role
             if required_role and role != required_role:
@@ -107,19 +189,19 @@ def verify_authentication(token, required_role=None):
         if not payload:
             return False, None, None
         
-        user_id = payload['user_id'] if 'user_id' in payload else None
+        # Session user IDs come from the database as ints; match them for signed tokens
+        user_id = int(payload['user_id']) if payload.get('user_id') is not None else None
         role = payload['role'] if 'role' in payload else None
         
-        # Check if the user has the required role
+        # Trust the decode for a while, but never past the token's own expiry
+        remaining = payload.get('exp', 0) - time.time()
+        if remaining > 0:
+            _decoded_tokens.add(token, user_id, role, min(remaining, _DECODED_TOKEN_TTL))
+        
+        # Check if the user has the required role; the signed token needs no session
         if required_role and role != required_role:
             return False, user_id, role
         
-        # Store the token
-        active_tokens[token] = {
-            'user_id': user_id,
-            'role': role
-        }
-        
         return True, user_id, role
     except Exception as e:
         logger.error(f"Error verifying authentication: {e}")
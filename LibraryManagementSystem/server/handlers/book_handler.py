@@ -2,245 +2,283 @@
 Book handler for the Library Management System server.
 """
 
+import logging
 from database.operations.book_ops import (
-    create_book, get_book_by_id, get_book_by_isbn, get_all_books,
+    create_book, get_book_by_id, get_book_by_isbn, get_all_books, get_books_page,
     search_books, update_book, delete_book
 )
 from database.operations.transaction_ops import (
-    create_transaction, get_transactions_by_book, return_book
+    create_transaction, get_transactions_by_book, get_transactions_by_book_page, return_book
 )
+from database.models.book import Book
 from .auth_handler import verify_authentication
+from .decorators import handler_exceptions
+from .paging import page_args, page_result
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def handle_book_request(action, data, token):
+# Actions only admins may perform
+_ADMIN_ONLY = frozenset(('book_create', 'book_update', 'book_delete', 'book_get_transactions'))
+
+# Book fields a client may send, in create_book/update_book argument order
+_BOOK_FIELDS = ('title', 'author', 'isbn', 'publisher', 'publication_year',
+                'category', 'description', 'quantity')
+
+def _unpack(data):
     """
-    Handle a book-related request.
+    Read the book fields of a request, which clients send under 'book' or 'data'.
     
     Args:
-        action (str): The action to perform.
         data (dict): The request data.
-        token (str): The authentication token.
         
     Returns:
-        tuple: (success, message, result_data)
+        dict: Every field in _BOOK_FIELDS, taken from 'book' first, else 'data', else None.
+            Falsy values such as a quantity of 0 are kept.
     """
-    try:
-        # Verify authentication
-        authenticated, user_id, role = verify_authentication(token)
-        
-        if not authenticated:
-            return False, "Authentication required", {}
-        
-        # Handle the request based on the action
-        if action == 'book_create':
-            # Only admins can create books
-            if role != 'admin':
-                return False, "Admin privileges required", {}
-            
-            # Extract book data from the data field
-            book_data = data.get('data', {})
-            title = book_data.get('title')
-            author = book_data.get('author')
-            isbn = book_data.get('isbn')
-            publisher = book_data.get('publisher')
-            publication_year = book_data.get('publication_year')
-            category = book_data.get('category')
-            description = book_data.get('description')
-            quantity = book_data.get('quantity', 1)
-            
-            # Validate required fields
-            if not title or not author or not isbn:
-                return False, "Title, author, and ISBN are required", {}
-            
-            # Create the book
-            book_id = create_book(
-                title, author, isbn, publisher, publication_year,
-                category, description, quantity
-            )
-            
-            if not book_id:
-                return False, "Failed to create book", {}
-            
-            # Get the created book
-            book = get_book_by_id(book_id)
-            
-            return True, "Book created successfully", book.to_dict()
-        
-        elif action == 'book_get':
-            # Extract book ID
-            book_id = data.get('book_id')
-            
-            if not book_id:
-                return False, "Book ID is required", {}
-            
-            # Get the book
-            book = get_book_by_id(book_id)
-            
-            if not book:
-                return False, "Book not found", {}
-            
-            return True, "Book retrieved successfully", book.to_dict()
-        
-        elif action == 'book_get_by_isbn':
-            # Extract ISBN
-            isbn = data.get('isbn')
-            
-            if not isbn:
-                return False, "ISBN is required", {}
-            
-            # Get the book
-            book = get_book_by_isbn(isbn)
-            
-            if not book:
-                return False, "Book not found", {}
-            
-            return True, "Book retrieved successfully", book.to_dict()
-        
-        elif action == 'book_get_all':
-            # Get all books
-            books = get_all_books()
-            
-            # Convert books to dict format
-            book_dicts = [book.to_dict() for book in books]
-            
-            # Log for debugging
-            logger.info(f"Retrieved {len(books)} books with token {token}")
-            
-            return True, f"{len(books)} books retrieved", book_dicts
-        
-        elif action == 'book_search':
-            # Extract search parameters
-            query = data.get('query')
-            search_by = data.get('search_by', 'title')
-            
-            if not query:
-                return False, "Search query is required", {}
-            
-            # Search for books
-            books = search_books(query, search_by)
-            
-            return True, f"{len(books)} books found", [book.to_dict() for book in books]
-        
-        elif action == 'book_update':
-            # Only admins can update books
-            if role != 'admin':
-                return False, "Admin privileges required", {}
-            
-            # Extract book data
-            book_id = data.get('book_id')
-            book_data = data.get('data', {})
-            book = data.get('book', {})
-            
-            # Log the incoming data for debugging
-            logger.info(f"Book update request: book_id={book_id}, book={book}, data={book_data}")
-            
-            # Try to get data from both possible sources
-            title = book.get('title') or book_data.get('title')
-            author = book.get('author') or book_data.get('author')
-            isbn = book.get('isbn') or book_data.get('isbn')
-            publisher = book.get('publisher') or book_data.get('publisher')
-            publication_year = book.get('publication_year') or book_data.get('publication_year')
-            category = book.get('category') or book_data.get('category')
-            description = book.get('description') or book_data.get('description')
-            quantity = book.get('quantity') or book_data.get('quantity')
-            
-            if not book_id:
-                return False, "Book ID is required", {}
-            
-            # Update the book
-            success = update_book(
-                book_id, title, author, isbn, publisher,
-                publication_year, category, description, quantity
-            )
-            
-            if not success:
-                return False, "Failed to update book", {}
-            
-            # Get the updated book
-            book = get_book_by_id(book_id)
-            
-            return True, "Book updated successfully", book.to_dict()
+    book = data.get('book') or {}
+    book_data = data.get('data') or {}
+    
+    fields = {}
+    for field in _BOOK_FIELDS:
+        value = book.get(field)
+        fields[field] = book_data.get(field) if value is None else value
+    return fields
+
+def _book_create(data, user_id, role):
+    """Create a book from the request's book or data field."""
+    # Extract book data
+    fields = _unpack(data)
+    if fields['quantity'] is None:
+        fields['quantity'] = 1
+    
+    # Validate required fields
+    if not fields['title'] or not fields['author'] or not fields['isbn']:
+        return False, "Title, author, and ISBN are required", {}
+    
+    # Create the book
+    book_id = create_book(**fields)
+    
+    if not book_id:
+        return False, "Failed to create book", {}
+    
+    # Get the created book
+    book = get_book_by_id(book_id)
+    
+    return True, "Book created successfully", book.to_dict()
+
+def _book_get(data, user_id, role):
+    """Get a book by ID."""
+    # Extract book ID
+    book_id = data.get('book_id')
+    
+    if not book_id:
+        return False, "Book ID is required", {}
+    
+    # Get the book
+    book = get_book_by_id(book_id)
+    
+    if not book:
+        return False, "Book not found", {}
+    
+    return True, "Book retrieved successfully", book.to_dict()
+
+def _book_get_by_isbn(data, user_id, role):
+    """Get a book by ISBN."""
+    # Extract ISBN
+    isbn = data.get('isbn')
+    
+    if not isbn:
+        return False, "ISBN is required", {}
+    
+    # Get the book
+    book = get_book_by_isbn(isbn)
+    
+    if not book:
+        return False, "Book not found", {}
+    
+    return True, "Book retrieved successfully", book.to_dict()
+
+def _book_get_all(data, user_id, role):
+    """Get every book, or one page of books if the request asks for it."""
+    paging = page_args(data)
+    if paging:
+        cursor, limit = paging
+        books = get_books_page(cursor, limit)
+        last_id = books[-1].book_id if books else None
         
-        elif action == 'book_delete':
-            # Only admins can delete books
-            if role != 'admin':
-                return False, "Admin privileges required", {}
-            
-            # Extract book ID
-            book_id = data.get('book_id')
-            
-            if not book_id:
-                return False, "Book ID is required", {}
-            
-            # Delete the book
-            success = delete_book(book_id)
-            
-            if not success:
-                return False, "Failed to delete book", {}
-            
-            return True, "Book deleted successfully", {}
+        return True, f"{len(books)} books retrieved", page_result(Book.to_dict_batch(books), last_id, limit)
+    
+    # Get all books
+    books = get_all_books()
+    
+    # Convert books to dict format
+    book_dicts = Book.to_dict_batch(books)
+    
+    # Log for debugging
+    logger.info("Retrieved %d books for user %s", len(books), user_id)
+    
+    return True, f"{len(books)} books retrieved", book_dicts
+
+def _book_search(data, user_id, role):
+    """Search books by a field."""
+    # Extract search parameters
+    query = data.get('query')
+    search_by = data.get('search_by', 'title')
+    
+    if not query:
+        return False, "Search query is required", {}
+    
+    # Search for books
+    books = search_books(query, search_by)
+    
+    return True, f"{len(books)} books found", Book.to_dict_batch(books)
+
+def _book_update(data, user_id, role):
+    """Update a book from the request's book or data field."""
+    # Extract book data
+    book_id = data.get('book_id')
+    fields = _unpack(data)
+    
+    # Log the incoming data for debugging; skip the dict repr unless it will be shown
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Book update request: book_id=%s, fields=%s", book_id, fields)
+    
+    if not book_id:
+        return False, "Book ID is required", {}
+    
+    # Update the book
+    success = update_book(book_id, **fields)
+    
+    if not success:
+        return False, "Failed to update book", {}
+    
+    # Get the updated book
+    book = get_book_by_id(book_id)
+    
+    return True, "Book updated successfully", book.to_dict()
+
+def _book_delete(data, user_id, role):
+    """Delete a book."""
+    # Extract book ID
+    book_id = data.get('book_id')
+    
+    if not book_id:
+        return False, "Book ID is required", {}
+    
+    # Delete the book
+    success = delete_book(book_id)
+    
+    if not success:
+        return False, "Failed to delete book", {}
+    
+    return True, "Book deleted successfully", {}
+
+def _book_borrow(data, user_id, role):
+    """Borrow a book for the authenticated user."""
+    # Extract book ID
+    book_id = data.get('book_id')
+    loan_period_days = data.get('loan_period_days', 14)
+    
+    if not book_id:
+        return False, "Book ID is required", {}
+    
+    # Create a transaction; it only inserts while a copy is available
+    transaction_id = create_transaction(user_id, book_id, loan_period_days)
+    
+    if not transaction_id:
+        # Look the book up only to explain the failure
+        book = get_book_by_id(book_id)
         
-        elif action == 'book_borrow':
-            # Extract book ID
-            book_id = data.get('book_id')
-            loan_period_days = data.get('loan_period_days', 14)
-            
-            if not book_id:
-                return False, "Book ID is required", {}
-            
-            # Check if the book exists and is available
-            book = get_book_by_id(book_id)
-            
-            if not book:
-                return False, "Book not found", {}
-            
-            if not book.is_available():
-                return False, "Book is not available", {}
-            
-            # Create a transaction
-            transaction_id = create_transaction(user_id, book_id, loan_period_days)
-            
-            if not transaction_id:
-                return False, "Failed to borrow book", {}
-            
-            return True, "Book borrowed successfully", {'transaction_id': transaction_id}
+        if not book:
+            return False, "Book not found", {}
         
-        elif action == 'book_return':
-            # Extract transaction ID
-            transaction_id = data.get('transaction_id')
-            
-            if not transaction_id:
-                return False, "Transaction ID is required", {}
-            
-            # Return the book
-            success = return_book(transaction_id)
-            
-            if not success:
-                return False, "Failed to return book", {}
-            
-            return True, "Book returned successfully", {}
+        if not book.is_available():
+            return False, "Book is not available", {}
         
-        elif action == 'book_get_transactions':
-            # Only admins can view all transactions for a book
-            if role != 'admin':
-                return False, "Admin privileges required", {}
-            
-            # Extract book ID
-            book_id = data.get('book_id')
-            status = data.get('status')
-            
-            if not book_id:
-                return False, "Book ID is required", {}
-            
-            # Get transactions
-            transactions = get_transactions_by_book(book_id, status)
-            
-            return True, f"{len(transactions)} transactions retrieved", [t.to_dict() for t in transactions]
+        return False, "Failed to borrow book", {}
+    
+    return True, "Book borrowed successfully", {'transaction_id': transaction_id}
+
+def _book_return(data, user_id, role):
+    """Return a borrowed book."""
+    # Extract transaction ID
+    transaction_id = data.get('transaction_id')
+    
+    if not transaction_id:
+        return False, "Transaction ID is required", {}
+    
+    # Return the book
+    success = return_book(transaction_id)
+    
+    if not success:
+        return False, "Failed to return book", {}
+    
+    return True, "Book returned successfully", {}
+
+def _book_get_transactions(data, user_id, role):
+    """Get the transactions of a book, or one page of them if the request asks for it."""
+    # Extract book ID
+    book_id = data.get('book_id')
+    status = data.get('status')
+    
+    if not book_id:
+        return False, "Book ID is required", {}
+    
+    paging = page_args(data)
+    if paging:
+        cursor, limit = paging
+        transactions = get_transactions_by_book_page(book_id, status, cursor, limit)
+        items = [t.to_dict() for t in transactions]
+        last_id = transactions[-1].transaction_id if transactions else None
         
-        else:
-            return False, f"Unknown action: {action}", {}
-    except Exception as e:
-        logger.error(f"Error handling book request: {e}")
-        return False, f"Server error: {str(e)}", {}
+        return True, f"{len(transactions)} transactions retrieved", page_result(items, last_id, limit)
+    
+    # Get transactions
+    transactions = get_transactions_by_book(book_id, status)
+    
+    return True, f"{len(transactions)} transactions retrieved", [t.to_dict() for t in transactions]
+
+# Handlers by action, each called as handler(data, user_id, role)
+_BOOK_ACTIONS = {
+    'book_create': _book_create,
+    'book_get': _book_get,
+    'book_get_by_isbn': _book_get_by_isbn,
+    'book_get_all': _book_get_all,
+    'book_search': _book_search,
+    'book_update': _book_update,
+    'book_delete': _book_delete,
+    'book_borrow': _book_borrow,
+    'book_return': _book_return,
+    'book_get_transactions': _book_get_transactions,
+}
+
+@handler_exceptions(logger, 'book request')
+def handle_book_request(action, data, token):
+    """
+    Handle a book-related request.
+    
+    Args:
+        action (str): The action to perform.
+        data (dict): The request data.
+        token (str): The authentication token.
+    
+    Returns:
+        tuple: (success, message, result_data)
+    """
+    # Verify authentication
+    authenticated, user_id, role = verify_authentication(token)
+    
+    if not authenticated:
+        return False, "Authentication required", {}
+    
+    # Look up the handler for the action
+    handler = _BOOK_ACTIONS.get(action)
+    
+    if handler is None:
+        return False, f"Unknown action: {action}", {}
+    
+    if action in _ADMIN_ONLY and role != 'admin':
+        return False, "Admin privileges required", {}
+    
+    return handler(data, user_id, role)
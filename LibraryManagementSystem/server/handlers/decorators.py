@@ -0,0 +1,29 @@
+"""
+Decorators shared by the request handlers of the Library Management System server.
+"""
+
+import functools
+
+def handler_exceptions(logger, what):
+    """
+    Turn any exception escaping a request handler into a server error response.
+    
+    Args:
+        logger (logging.Logger): The handler module's logger.
+        what (str): What the handler handles, for log messages (e.g. 'book request').
+        
+    Returns:
+        callable: A decorator for functions returning (success, message, result_data).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error handling %s: %s", what, e)
+                return False, f"Server error: {str(e)}", {}
+        
+        return wrapper
+    
+    return decorator
@@ -0,0 +1,43 @@
+"""
+Keyset paging shared by the request handlers of the Library Management System server.
+
+Listing actions return everything unless the request carries 'limit' or 'cursor'.
+A paged response is {'items': [...], 'next_cursor': id or None}; the client sends
+next_cursor back as 'cursor' to get the following page.
+"""
+
+# Rows per page when a client asks for paging without a limit
+DEFAULT_PAGE_SIZE = 200
+
+# Largest page a client may ask for
+MAX_PAGE_SIZE = 1000
+
+def page_args(data):
+    """
+    Read the paging parameters of a request.
+    
+    Args:
+        data (dict): The request data.
+        
+    Returns:
+        tuple or None: (cursor, limit), or None if the request isn't paged.
+    """
+    if 'limit' not in data and 'cursor' not in data:
+        return None
+    
+    limit = int(data.get('limit') or DEFAULT_PAGE_SIZE)
+    return data.get('cursor'), min(max(limit, 1), MAX_PAGE_SIZE)
+
+def page_result(items, last_id, limit):
+    """
+    Build a paged response.
+    
+    Args:
+        items (list): The serialized rows of the page.
+        last_id (int): The ID of the page's last row.
+        limit (int): The page size that was asked for.
+        
+    Returns:
+        dict: The page and the cursor of the next one, None after the last page.
+    """
+    return {'items': items, 'next_cursor': last_id if len(items) == limit else None}
@@ -4,6 +4,7 @@ Server entry point for the Library Management System.
 
 import sys
 import os
+import signal
 import threading
 import importlib.util
 
@@ -20,49 +21,97 @@ try:
     from LibraryManagementSystem.server.network.server import Server
     from LibraryManagementSystem.utils.logger import get_logger
     from LibraryManagementSystem.utils.config import SERVER_HOST, SERVER_PORT, MAX_CONNECTIONS
-    from LibraryManagementSystem.database.db_manager import initialize_database
+    from LibraryManagementSystem.database.db_manager import initialize_database, schedule_optimize
+    from LibraryManagementSystem.database.operations.transaction_ops import run_maintenance
 except ImportError:
     # Fall back to relative imports (when running directly)
     try:
         from server.network.server import Server
         from utils.logger import get_logger
         from utils.config import SERVER_HOST, SERVER_PORT, MAX_CONNECTIONS
-        from database.db_manager import initialize_database
+        from database.db_manager import initialize_database, schedule_optimize
+        from database.operations.transaction_ops import run_maintenance
     except ImportError:
         # Last resort: try relative import for server only
         from .network.server import Server
         from utils.logger import get_logger
         from utils.config import SERVER_HOST, SERVER_PORT, MAX_CONNECTIONS
-        from database.db_manager import initialize_database
+        from database.db_manager import initialize_database, schedule_optimize
+        from database.operations.transaction_ops import run_maintenance
 
 logger = get_logger(__name__)
 
+def _read_console(request_stop):
+    """
+    Stop the server when 'quit' is typed on an interactive console.
+    
+    Args:
+        request_stop (callable): Called to stop the server.
+    """
+    try:
+        while input("Enter 'quit' to stop the server: ").lower() != 'quit':
+            pass
+    except EOFError:
+        pass
+    
+    request_stop()
+
 def main():
     """Main entry point for the server application."""
     try:
         # Initialize the database
         initialize_database()
         
-        # Create and start the server
+        # Bring loan statuses up to date before serving clients
+        run_maintenance()
+        
+        # Keep query planner statistics fresh while the server runs
+        schedule_optimize()
+        
+        # Bind before going any further, so a taken port fails the process
         server = Server(SERVER_HOST, SERVER_PORT, MAX_CONNECTIONS)
-        server_thread = threading.Thread(target=server.start)
-        server_thread.daemon = True
+        try:
+            server.listen()
+        except OSError as e:
+            logger.error(f"Error starting server: {e}")
+            sys.exit(1)
+        
+        # Stop on SIGINT or SIGTERM; handlers can only be installed from the main thread
+        stop_event = threading.Event()
+        stop_requested = threading.Event()
+        
+        def request_stop(*_):
+            stop_requested.set()
+            stop_event.set()
+        
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, request_stop)
+        
+        # Accept connections on a worker thread, waking the main thread if it ends
+        def serve():
+            server.start()
+            stop_event.set()
+        
+        server_thread = threading.Thread(target=serve)
         server_thread.start()
         
-        logger.info(f"Server started on {SERVER_HOST}:{SERVER_PORT}")
+        # Also accept 'quit' when someone is at the console
+        if sys.stdin is not None and sys.stdin.isatty():
+            threading.Thread(target=_read_console, args=(request_stop,), daemon=True).start()
         
-        # Keep the main thread running
-        try:
-            while True:
-                cmd = input("Enter 'quit' to stop the server: ")
-                if cmd.lower() == 'quit':
-                    break
-        except KeyboardInterrupt:
-            pass
+        # Sleep until asked to stop, or until the server stops by itself
+        stop_event.wait()
         
         # Stop the server
         server.stop()
+        server_thread.join()
         logger.info("Server stopped")
+        
+        # Let supervisors restart a server that died without being asked to stop
+        if not stop_requested.is_set():
+            logger.error("Server stopped unexpectedly")
+            sys.exit(1)
     except Exception as e:
         logger.error(f"Error in server main: {e}")
         sys.exit(1)
@@ -5,15 +5,43 @@ Server network module for the Library Management System.
 import socket
 import json
 import threading
-import time
-import ssl
 from utils.logger import get_logger
+from utils.protocol import HEADER, frame_message, parse_header, unpack_payload
+from database.db_manager import close_connection
 from ..handlers.auth_handler import handle_login, handle_logout
 from ..handlers.book_handler import handle_book_request
 from ..handlers.user_handler import handle_user_request
 
 logger = get_logger(__name__)
 
+# Use orjson for messages when it is installed; it reads and writes the same
+# wire format as the standard library
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    
+    def _loads(data):
+        return json.loads(data)
+
+def _shutdown(sock):
+    """
+    Wake any thread blocked in accept() or recv() on a socket before it is closed.
+    
+    Closing a socket from another thread does not interrupt those calls on Linux.
+    
+    Args:
+        sock (socket.socket): The socket.
+    """
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        # Already disconnected, or never connected
+        pass
+
 class ClientHandler(threading.Thread):
     """Handler for client connections."""
     
@@ -42,11 +70,11 @@ class ClientHandler(threading.Thread):
         try:
             while self.running:
                 # Receive the request length first (4 bytes)
-                length_bytes = self._receive_exactly(4)
+                length_bytes = self._receive_exactly(HEADER.size)
                 if not length_bytes:
                     break
                 
-                request_length = int.from_bytes(length_bytes, byteorder='big')
+                request_length, compressed = parse_header(length_bytes)
                 
                 # Receive the request
                 request_bytes = self._receive_exactly(request_length)
@@ -54,22 +82,17 @@ class ClientHandler(threading.Thread):
                     break
                 
                 # Decode the request
-                request_json = request_bytes.decode('utf-8')
-                request = json.loads(request_json)
+                request = _loads(unpack_payload(request_bytes, compressed))
                 
                 # Handle the request
                 response = self._handle_request(request)
                 
                 # Encode the response
-                response_json = json.dumps(response)
-                response_bytes = response_json.encode('utf-8')
-                
-                # Send the response length first (4 bytes)
-                length_bytes = len(response_bytes).to_bytes(4, byteorder='big')
-                self.socket.sendall(length_bytes)
+                response_bytes = _dumps(response)
                 
-                # Send the response
-                self.socket.sendall(response_bytes)
+                # Send the response length (4 bytes) and the response in one write,
+                # compressing large responses
+                self.socket.sendall(frame_message(response_bytes))
         except Exception as e:
             logger.error(f"Error handling client: {e}")
         finally:
@@ -198,6 +221,10 @@ class ClientHandler(threading.Thread):
         try:
             self.running = False
             self.socket.close()
+            
+            # Release this handler thread's database connection
+            close_connection()
+            
             logger.info(f"Client disconnected from {self.address[0]}:{self.address[1]}")
         except Exception as e:
             logger.error(f"Error cleaning up client handler: {e}")
@@ -221,12 +248,17 @@ class Server:
         self.running = False
         self.clients = []
     
-    def start(self):
-        """Start the server."""
+    def listen(self):
+        """
+        Bind the server socket and start listening, without accepting connections yet.
+        
+        Raises:
+            OSError: If the address can't be bound, e.g. because the port is in use.
+        """
+        # Create a socket
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        
         try:
-            # Create a socket
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            
             # Allow reuse of the address
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             
@@ -235,10 +267,20 @@ class Server:
             
             # Listen for connections
             self.socket.listen(self.max_connections)
-            
-            self.running = True
-            
-            logger.info(f"Server started on {self.host}:{self.port}")
+        except OSError:
+            self.socket.close()
+            self.socket = None
+            raise
+        
+        self.running = True
+        
+        logger.info(f"Server started on {self.host}:{self.port}")
+    
+    def start(self):
+        """Start the server, listening first unless listen() was already called."""
+        try:
+            if self.socket is None:
+                self.listen()
             
             # Accept connections
             while self.running:
@@ -271,6 +313,7 @@ class Server:
         for client in self.clients[:]:
             try:
                 client.running = False
+                _shutdown(client.socket)
                 client.socket.close()
                 self.clients.remove(client)
             except Exception as e:
@@ -279,6 +322,7 @@ class Server:
         # Close the server socket
         if self.socket:
             try:
+                _shutdown(self.socket)
                 self.socket.close()
             except Exception as e:
                 logger.error(f"Error closing server socket: {e}")
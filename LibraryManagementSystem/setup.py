@@ -19,6 +19,12 @@ setup(
         "beautifulsoup4>=4.9.0",
         "pyjwt>=2.0.0",
     ],
+    extras_require={
+        "speedups": [
+            "msgspec>=0.18.0",
+            "orjson>=3.6.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "library-server=LibraryManagementSystem.server.main:main",
@@ -0,0 +1,222 @@
+"""
+Unit tests for book database operations.
+"""
+
+import unittest
+import os
+import sys
+import io
+import shutil
+import tempfile
+import contextlib
+import json
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from database import db_manager
+from database.models.book import Book
+from database.operations import book_ops
+from database.operations.book_ops import (
+    create_book, create_book_returning, create_books_bulk, delete_book, get_all_books,
+    get_all_books_json, get_book_by_id, get_books_page, iter_all_books, search_books, search_books_paged,
+    update_book
+)
+from database.operations.transaction_ops import create_transaction
+
+class TestBookOps(unittest.TestCase):
+    """Test case for book database operations."""
+    
+    def setUp(self):
+        """Set up a fresh database in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path_patch = patch.object(
+            db_manager, 'DATABASE_PATH', os.path.join(self.temp_dir, 'library.db'))
+        self.db_path_patch.start()
+        
+        # Silence the initialization progress output
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager.initialize_database()
+    
+    def tearDown(self):
+        """Remove the temporary database."""
+        db_manager.close_connection()
+        self.db_path_patch.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_create_books_bulk(self):
+        """Test creating several books in one call."""
+        books = [
+            Book(title='Python Basics', author='John Smith', isbn='1111', quantity=3),
+            Book(title='Data Science', author='Jane Doe', isbn='2222', quantity=2),
+        ]
+        
+        self.assertEqual(create_books_bulk(books), 2)
+        
+        created = get_all_books()
+        self.assertEqual([book.title for book in created], ['Data Science', 'Python Basics'])
+        self.assertEqual([book.available for book in created], [2, 3])
+        self.assertEqual([book.isbn for book in iter_all_books()], ['2222', '1111'])
+        self.assertEqual(json.loads(get_all_books_json()), [book.to_dict() for book in created])
+        self.assertEqual(Book.to_dict_batch(created), [book.to_dict() for book in created])
+    
+    def test_create_books_bulk_rolls_back_on_duplicate(self):
+        """Test that a duplicate ISBN leaves the whole batch uncreated."""
+        books = [
+            Book(title='Python Basics', author='John Smith', isbn='1111'),
+            Book(title='Python Basics Again', author='John Smith', isbn='1111'),
+        ]
+        
+        self.assertEqual(create_books_bulk(books), 0)
+        self.assertEqual(get_all_books(), [])
+    
+    def test_create_book_returning(self):
+        """Test that the created book comes back with its generated fields."""
+        book = create_book_returning('Python Basics', 'John Smith', '1111', quantity=2)
+        
+        self.assertIsNotNone(book.book_id)
+        self.assertIsNotNone(book.created_at)
+        self.assertEqual((book.quantity, book.available), (2, 2))
+        self.assertEqual(get_book_by_id(book.book_id).isbn, '1111')
+        
+        # A duplicate ISBN fails without raising
+        self.assertIsNone(create_book_returning('Python Basics', 'John Smith', '1111'))
+        self.assertEqual(create_book('Data Science', 'Jane Doe', '2222'), book.book_id + 1)
+    
+    def test_create_book_without_returning(self):
+        """Test creating books on SQLite versions without INSERT ... RETURNING."""
+        with patch.object(book_ops, '_HAS_RETURNING', False):
+            book_id = create_book('Python Basics', 'John Smith', '1111', quantity=2)
+            book = create_book_returning('Data Science', 'Jane Doe', '2222')
+            
+            self.assertIsNone(create_book('Python Basics', 'John Smith', '1111'))
+        
+        self.assertEqual(get_book_by_id(book_id).available, 2)
+        self.assertEqual(book.book_id, book_id + 1)
+        self.assertIsNotNone(book.created_at)
+        self.assertEqual(get_book_by_id(book.book_id).isbn, '2222')
+    
+    def test_search_books_uses_word_prefixes(self):
+        """Test that searches match word prefixes and follow book updates."""
+        create_books_bulk([
+            Book(title='Python Basics', author='John Smith', isbn='1111'),
+            Book(title='Data Science', author='Jane Doe', isbn='2222'),
+        ])
+        
+        self.assertEqual([book.isbn for book in search_books('pyth bas')], ['1111'])
+        self.assertEqual([book.isbn for book in search_books('jan', 'author')], ['2222'])
+        
+        # Substrings inside words still match through the fallback
+        self.assertEqual([book.isbn for book in search_books('cien')], ['2222'])
+        
+        # The index follows title changes
+        book_id = search_books('Python')[0].book_id
+        update_book(book_id, title='Rust Basics')
+        self.assertEqual(search_books('Python'), [])
+        self.assertEqual([book.isbn for book in search_books('rust')], ['1111'])
+    
+    def test_search_books_paged(self):
+        """Test that a page of results comes back with the total match count."""
+        create_books_bulk([
+            Book(title=f'Python Volume {i}', author='John Smith', isbn=str(i)) for i in range(5)
+        ] + [Book(title='Revolution', author='Jane Doe', isbn='2222')])
+        
+        # Word prefixes go through the full-text index without falling back
+        with patch.object(book_ops.logger, 'warning') as warning:
+            total, books = search_books_paged('pyth vol', offset=3, limit=2)
+            self.assertEqual(total, 5)
+            self.assertEqual(len(books), 2)
+            
+            # A page past the end keeps the index's matching rules
+            self.assertEqual(search_books_paged('vol', offset=5, limit=2), (0, []))
+        warning.assert_not_called()
+        
+        # Substring matches are paged through the fallback
+        total, books = search_books_paged('olum', limit=2)
+        self.assertEqual((total, len(books)), (5, 2))
+        
+        self.assertEqual(search_books_paged('python', search_by='publisher'), (0, []))
+    
+    def test_cached_book_reads_see_writes(self):
+        """Test that book writes and loans invalidate cached lookups by ID."""
+        book_id = create_book('Python Basics', 'John Smith', '1111', quantity=2)
+        self.assertEqual(get_book_by_id(book_id).available, 2)
+        
+        update_book(book_id, title='Rust Basics')
+        self.assertEqual(get_book_by_id(book_id).title, 'Rust Basics')
+        
+        create_transaction(1, book_id)
+        self.assertEqual(get_book_by_id(book_id).available, 1)
+        
+        other_id = create_book('Data Science', 'Jane Doe', '2222')
+        self.assertIsNone(get_book_by_id(other_id + 1))
+        self.assertTrue(delete_book(other_id))
+        self.assertIsNone(get_book_by_id(other_id))
+    
+    def test_cached_read_racing_a_write_is_not_stored(self):
+        """Test that rows read before a concurrent write are not cached after it."""
+        book_id = create_book('Python Basics', 'John Smith', '1111', quantity=2)
+        connection = db_manager.get_connection()
+        
+        class RacingCursor:
+            """A cursor that commits a write after fetching, before the rows are cached."""
+            
+            def __init__(self):
+                self.cursor = connection.cursor()
+                self.row_factory = None
+            
+            def execute(self, sql, params):
+                self.cursor.execute(sql, params)
+                return self
+            
+            def fetchall(self):
+                rows = self.cursor.fetchall()
+                update_book(book_id, title='Rust Basics')
+                return rows
+        
+        class RacingConnection:
+            """The real connection, except that it hands out racing cursors."""
+            
+            def cursor(self):
+                return RacingCursor()
+            
+            def __getattr__(self, name):
+                return getattr(connection, name)
+        
+        with patch.object(db_manager, 'get_connection', RacingConnection):
+            self.assertEqual(get_book_by_id(book_id).title, 'Python Basics')
+        
+        self.assertEqual(get_book_by_id(book_id).title, 'Rust Basics')
+    
+    def test_get_books_page(self):
+        """Test walking the books page by page from each page's last ID."""
+        create_books_bulk([
+            Book(title=f'Python Volume {i}', author='John Smith', isbn=str(i)) for i in range(5)
+        ])
+        
+        first = get_books_page(limit=3)
+        rest = get_books_page(first[-1].book_id, limit=3)
+        
+        self.assertEqual([book.isbn for book in first + rest], ['0', '1', '2', '3', '4'])
+        self.assertEqual(get_books_page(rest[-1].book_id), [])
+    
+    def test_update_and_delete_respect_loans(self):
+        """Test that borrowed copies block shrinking and deleting a book."""
+        create_books_bulk([Book(title='Python Basics', author='John Smith', isbn='1111', quantity=3)])
+        book_id = get_all_books()[0].book_id
+        
+        # Borrow one copy as the default admin user
+        self.assertIsNotNone(create_transaction(1, book_id))
+        
+        self.assertFalse(update_book(book_id, quantity=0))
+        self.assertTrue(update_book(book_id, title='Python Basics 2', quantity=2))
+        book = get_book_by_id(book_id)
+        self.assertEqual((book.title, book.quantity, book.available), ('Python Basics 2', 2, 1))
+        
+        self.assertFalse(delete_book(book_id))
+        self.assertFalse(update_book(book_id + 1, title='Missing'))
+        self.assertFalse(delete_book(book_id + 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for transaction database operations.
+"""
+
+import unittest
+import os
+import sys
+import io
+import shutil
+import tempfile
+import contextlib
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from database import db_manager
+from database.operations.book_ops import create_book, delete_book, get_book_by_id
+from database.operations.transaction_ops import (
+    create_transaction, create_transactions_bulk, get_transaction_by_id, get_transaction_details,
+    get_all_transactions, get_transactions_by_book_page, get_transactions_by_user,
+    iter_all_transactions, return_book, return_books_bulk, run_maintenance
+)
+
+class TestTransactionOps(unittest.TestCase):
+    """Test case for transaction database operations."""
+    
+    def setUp(self):
+        """Set up a fresh database with one book in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path_patch = patch.object(
+            db_manager, 'DATABASE_PATH', os.path.join(self.temp_dir, 'library.db'))
+        self.db_path_patch.start()
+        
+        # Silence the initialization progress output
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager.initialize_database()
+        
+        self.book_id = create_book('Python Basics', 'John Smith', '1111', quantity=2)
+    
+    def tearDown(self):
+        """Remove the temporary database."""
+        db_manager.close_connection()
+        self.db_path_patch.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_create_transaction(self):
+        """Test that borrowing records a loan and takes a copy out of stock."""
+        transaction_id = create_transaction(1, self.book_id)
+        
+        self.assertIsNotNone(transaction_id)
+        self.assertEqual(get_transaction_by_id(transaction_id).status, 'borrowed')
+        self.assertEqual(get_book_by_id(self.book_id).available, 1)
+    
+    def test_get_transaction_details(self):
+        """Test that details combine the loan with its user and book."""
+        transaction_id = create_transaction(1, self.book_id)
+        
+        details = get_transaction_details(transaction_id)
+        
+        self.assertEqual(details['transaction_id'], transaction_id)
+        self.assertEqual(details['username'], 'admin')
+        self.assertEqual((details['book_title'], details['book_isbn']), ('Python Basics', '1111'))
+        self.assertIsNone(get_transaction_details(transaction_id + 1))
+    
+    def test_create_transaction_requires_available_copy(self):
+        """Test that borrowing stops once no copies are left."""
+        self.assertIsNotNone(create_transaction(1, self.book_id))
+        self.assertIsNotNone(create_transaction(1, self.book_id))
+        
+        self.assertIsNone(create_transaction(1, self.book_id))
+        self.assertIsNone(create_transaction(1, self.book_id + 1))
+        self.assertEqual(get_book_by_id(self.book_id).available, 0)
+    
+    def test_create_transactions_bulk(self):
+        """Test that a batch borrows only the copies that are available."""
+        other_id = create_book('Data Science', 'Jane Doe', '2222')
+        
+        # Three requests for a book with two copies, one for a book that doesn't exist
+        book_ids = [self.book_id, other_id, self.book_id, self.book_id, other_id + 1]
+        
+        self.assertEqual(create_transactions_bulk(1, book_ids), 3)
+        self.assertEqual(get_book_by_id(self.book_id).available, 0)
+        self.assertEqual(get_book_by_id(other_id).available, 0)
+    
+    def test_cached_reads_see_writes(self):
+        """Test that writes invalidate cached transaction lists."""
+        self.assertEqual(get_transactions_by_user(1), [])
+        
+        transaction_id = create_transaction(1, self.book_id)
+        self.assertEqual([t.transaction_id for t in get_transactions_by_user(1)], [transaction_id])
+        
+        self.assertTrue(return_book(transaction_id))
+        self.assertEqual(get_transactions_by_user(1, 'borrowed'), [])
+        self.assertEqual(get_transaction_by_id(transaction_id).status, 'returned')
+    
+    def test_return_books_bulk(self):
+        """Test that a batch returns only loans that are still borrowed."""
+        first_id = create_transaction(1, self.book_id)
+        second_id = create_transaction(1, self.book_id)
+        self.assertTrue(return_book(first_id))
+        
+        # One loan already returned, one borrowed, one that doesn't exist
+        self.assertEqual(return_books_bulk([first_id, second_id, second_id + 1]), 1)
+        self.assertEqual(get_transaction_by_id(second_id).status, 'returned')
+        self.assertEqual(get_book_by_id(self.book_id).available, 2)
+        self.assertEqual(return_books_bulk([]), 0)
+    
+    def test_list_transactions_in_pages(self):
+        """Test paging and streaming through all transactions."""
+        first_id = create_transaction(1, self.book_id)
+        second_id = create_transaction(1, self.book_id)
+        
+        # Newest first, whether paged or streamed in small batches
+        self.assertEqual([t.transaction_id for t in get_all_transactions(limit=1)], [second_id])
+        self.assertEqual([t.transaction_id for t in get_all_transactions(limit=1, offset=1)], [first_id])
+        self.assertEqual([t.transaction_id for t in iter_all_transactions(batch=1)],
+                         [second_id, first_id])
+        self.assertEqual(list(iter_all_transactions('returned')), [])
+        
+        # A book's loans page newest first from each page's last ID
+        page = get_transactions_by_book_page(self.book_id, limit=1)
+        self.assertEqual([t.transaction_id for t in page], [second_id])
+        page = get_transactions_by_book_page(self.book_id, before_id=page[-1].transaction_id)
+        self.assertEqual([t.transaction_id for t in page], [first_id])
+        self.assertEqual(get_transactions_by_book_page(self.book_id, 'returned'), [])
+    
+    def test_run_maintenance_marks_overdue_loans(self):
+        """Test that only loans past their due date are marked overdue."""
+        late_id = create_transaction(1, self.book_id, loan_period_days=-1)
+        current_id = create_transaction(1, self.book_id)
+        
+        self.assertEqual(run_maintenance(), 1)
+        self.assertEqual(get_transaction_by_id(late_id).status, 'overdue')
+        self.assertEqual(get_transaction_by_id(current_id).status, 'borrowed')
+    
+    def test_overdue_loans_can_be_returned(self):
+        """Test that overdue loans stay open until returned, then restock the book."""
+        first_id = create_transaction(1, self.book_id, loan_period_days=-1)
+        second_id = create_transaction(1, self.book_id, loan_period_days=-1)
+        self.assertEqual(run_maintenance(), 2)
+        
+        # Overdue copies still count as out on loan
+        self.assertFalse(delete_book(self.book_id))
+        
+        self.assertTrue(return_book(first_id))
+        self.assertEqual(return_books_bulk([second_id]), 1)
+        self.assertEqual(get_transaction_by_id(second_id).status, 'returned')
+        self.assertEqual(get_book_by_id(self.book_id).available, 2)
+
+if __name__ == '__main__':
+    unittest.main()
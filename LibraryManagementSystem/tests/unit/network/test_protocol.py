@@ -0,0 +1,59 @@
+"""
+Unit tests for message framing.
+"""
+
+import unittest
+import os
+import sys
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../')))
+
+from utils.protocol import (
+    HEADER, COMPRESSION_THRESHOLD, frame_message, parse_header, unpack_payload
+)
+
+class TestProtocol(unittest.TestCase):
+    """Test case for message framing."""
+    
+    def _round_trip(self, payload):
+        """Frame a payload and read it back."""
+        frame = frame_message(payload)
+        length, compressed = parse_header(frame[:HEADER.size])
+        body = frame[HEADER.size:]
+        
+        self.assertEqual(length, len(body))
+        return unpack_payload(body, compressed), compressed
+    
+    def test_small_payload_is_not_compressed(self):
+        """Test that small payloads are sent as is."""
+        payload = json.dumps({'action': 'ping'}).encode('utf-8')
+        
+        result, compressed = self._round_trip(payload)
+        
+        self.assertFalse(compressed)
+        self.assertEqual(result, payload)
+    
+    def test_large_payload_is_compressed(self):
+        """Test that large, repetitive payloads are compressed and restored."""
+        books = [{'book_id': i, 'title': 'Python Basics', 'available': 1} for i in range(100)]
+        payload = json.dumps(books).encode('utf-8')
+        self.assertGreater(len(payload), COMPRESSION_THRESHOLD)
+        
+        result, compressed = self._round_trip(payload)
+        
+        self.assertTrue(compressed)
+        self.assertEqual(result, payload)
+    
+    def test_incompressible_payload_is_not_compressed(self):
+        """Test that payloads that don't shrink are sent as is."""
+        payload = os.urandom(COMPRESSION_THRESHOLD * 2)
+        
+        result, compressed = self._round_trip(payload)
+        
+        self.assertFalse(compressed)
+        self.assertEqual(result, payload)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,9 @@ SERVER_PORT = 9000
 MAX_CONNECTIONS = 10
 BUFFER_SIZE = 4096
 
+# Client configuration
+CLIENT_CONNECTIONS = 2  # connections each client opens to the server
+
 # Security configuration
 PASSWORD_SALT = 'library_management_system'  # In production, this should be a random string
 TOKEN_EXPIRY = 3600  # seconds (1 hour)
@@ -0,0 +1,64 @@
+"""
+Message framing shared by the client and server of the Library Management System.
+
+Each message is sent as a 4-byte big-endian length followed by the payload.
+The top bit of the length marks a payload that was compressed with zlib.
+"""
+
+import struct
+import zlib
+
+# Length prefix: 4-byte big-endian unsigned int
+HEADER = struct.Struct('>I')
+
+# Top bit of the length prefix, set when the payload is compressed
+COMPRESSED_FLAG = 1 << 31
+
+# Payloads larger than this many bytes are compressed before sending
+COMPRESSION_THRESHOLD = 1024
+
+def frame_message(payload):
+    """
+    Build a length-prefixed frame for a payload, compressing it if large.
+    
+    Args:
+        payload (bytes): The encoded message.
+    
+    Returns:
+        bytes: The header and payload, ready to send.
+    """
+    if len(payload) > COMPRESSION_THRESHOLD:
+        compressed = zlib.compress(payload, 1)
+        
+        # Only send the compressed form if it actually saves bytes
+        if len(compressed) < len(payload):
+            return HEADER.pack(len(compressed) | COMPRESSED_FLAG) + compressed
+    
+    return HEADER.pack(len(payload)) + payload
+
+def parse_header(header):
+    """
+    Parse a length prefix.
+    
+    Args:
+        header (bytes): The 4-byte header.
+    
+    Returns:
+        tuple: (length, compressed) where length is the payload size in bytes
+            and compressed is True if the payload must be decompressed.
+    """
+    (value,) = HEADER.unpack(header)
+    return value & ~COMPRESSED_FLAG, bool(value & COMPRESSED_FLAG)
+
+def unpack_payload(payload, compressed):
+    """
+    Undo any compression applied by frame_message.
+    
+    Args:
+        payload (bytes): The received payload.
+        compressed (bool): Whether the header marked the payload as compressed.
+    
+    Returns:
+        bytes: The encoded message.
+    """
+    return zlib.decompress(payload) if compressed else payload